@@ -0,0 +1,16 @@
+"""Flat-book multi-route trading optimization.
+
+``build_model``, ``solve`` and ``report`` are loaded on first use, so
+``import flatbook`` stays cheap; ``python -m flatbook`` runs the CLI.
+"""
+_API = ("build_model", "solve", "report")
+
+__all__ = list(_API)
+
+
+def __getattr__(name):
+    if name in _API:
+        from flatbook import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module 'flatbook' has no attribute {name!r}")
@@ -0,0 +1,3 @@
+from flatbook.cli import main
+
+raise SystemExit(main(script="python -m flatbook", prog="python -m flatbook"))
@@ -0,0 +1,241 @@
+"""Library entry points: price a model, solve it with any engine and report the result.
+
+Nothing here imports PuLP, SciPy or HiGHS until ``solve`` needs them, so
+pricing-only callers (screening, risk, reporting) start quickly::
+
+    import flatbook
+
+    problem = flatbook.build_model(storage_cost=0.25)
+    solution = flatbook.solve(problem, engine="sparse")
+    for line in flatbook.report(problem, solution).lines():
+        print(line)
+"""
+import numpy as np
+
+from flatbook.defaults import default_inputs, monthly_capacity
+from flatbook.model import INVENTORY_CAP, SOLVE_MODES
+
+ENGINES = ("pulp", "sparse", "network", "decomposed", "rolling")
+# Inputs of ``route_economics``, a subset of ``default_inputs``.
+CURVE_INPUTS = ("months", "midland_price", "houston_price", "Delta_M", "Delta_H", "forecast_adjustment",
+                "pipeline_fixed", "storage_cost")
+
+
+class FlatBookProblem:
+    """Priced routes and limits of one flat-book model, ready for ``solve``.
+
+    A model built from curve inputs keeps them in ``inputs`` (the
+    ``default_inputs`` layout) with ``definition`` None; one loaded from a
+    definition directory keeps the ``ModelDefinition`` with ``inputs`` None.
+    """
+
+    def __init__(self, econ, cap, inventory_cap, storage_cost, inputs=None, definition=None):
+        self.econ = econ
+        self.cap = cap
+        self.inventory_cap = inventory_cap
+        self.storage_cost = storage_cost
+        self.inputs = inputs
+        self.definition = definition
+
+    @property
+    def months(self):
+        return list(self.econ.months)
+
+    def curve_inputs(self):
+        """Return the ``route_economics`` arguments of a curve-built model."""
+        if self.inputs is None:
+            raise ValueError("this model was loaded from a definition directory and has no curve inputs")
+        return {name: self.inputs[name] for name in CURVE_INPUTS}
+
+    def to_definition(self):
+        """Return the ``ModelDefinition``, building it from the curve inputs when needed."""
+        if self.definition is not None:
+            return self.definition
+        from flatbook.definition import definition_from_curves
+
+        return definition_from_curves(**self.inputs, inventory_cap=self.inventory_cap)
+
+
+def build_model(data=None, inventory_cap=None, **inputs):
+    """Price every route of a flat-book model without importing a solver.
+
+    With ``data`` the model is loaded from a definition directory (see
+    ``load_definition``). Otherwise it uses the shipped inputs in
+    ``flatbook.defaults``; keyword ``inputs`` override them, with curve and
+    capacity dicts merged month by month (``midland_price={"May": 69.8}``)
+    and scalars replaced (``storage_cost=0.25``). ``inventory_cap``
+    overrides the storage limit either way.
+    """
+    if data is not None:
+        if inputs:
+            raise ValueError("curve inputs cannot be combined with a definition directory")
+        from flatbook.definition import generate_routes, load_definition
+
+        # File-driven model: routes are generated only where the route table makes them eligible.
+        definition = load_definition(data)
+        if inventory_cap is not None:
+            definition.inventory_cap[:] = inventory_cap
+        return FlatBookProblem(generate_routes(definition), definition.capacity, definition.inventory_cap,
+                               definition.storage_cost, definition=definition)
+
+    from flatbook.economics import PRODUCTS, check_labels, route_economics
+
+    merged = default_inputs()
+    months = inputs.get("months", merged["months"])
+    for name, value in inputs.items():
+        if name not in merged:
+            raise ValueError(f"Unknown model input {name!r}")
+        if isinstance(merged[name], dict):
+            # daily_capacity is keyed by product; every other dict input by month.
+            if name == "daily_capacity":
+                check_labels(name, value, PRODUCTS, "product")
+            else:
+                check_labels(name, value, months)
+            value = {**merged[name], **value}
+        merged[name] = value
+    # Per-barrel long/short profit for every route, precomputed as one array
+    # indexed [product, buy location, sell option, buy month, sell month].
+    econ = route_economics(*(merged[name] for name in CURVE_INPUTS))
+    cap = monthly_capacity(merged["months"], merged["trading_days"], merged["daily_capacity"])
+    return FlatBookProblem(econ, cap, INVENTORY_CAP if inventory_cap is None else inventory_cap,
+                           merged["storage_cost"], inputs=merged)
+
+
+def _solve_pulp(problem, mode, screen, solver, limits, msg, telemetry):
+    import pulp
+
+    from flatbook.model import build_pulp_model, solve_with_cbc
+    from flatbook.solvers import race_pulp, solve_pulp
+    from flatbook.sparse import SparseSolution
+
+    with telemetry.phase("build"):
+        model = build_pulp_model(problem.econ, problem.cap, mode=mode, inventory_cap=problem.inventory_cap,
+                                 screen=screen)
+    with telemetry.phase("solve"):
+        if solver == "cbc":
+            telemetry.update(**solve_with_cbc(model.prob, msg=msg, capture_log=telemetry.enabled, **limits))
+        elif solver == "race":
+            telemetry.update(**race_pulp(model.prob, **limits))
+        else:
+            telemetry.update(**solve_pulp(model.prob, solver, msg=msg, **limits))
+    with telemetry.phase("extract"):
+        long, short = model.route_volumes()
+    telemetry.update(variables=model.prob.numVariables(), constraints=model.prob.numConstraints())
+    objective = pulp.value(model.prob.objective)
+    if objective is None and model.prob.status == pulp.LpStatusOptimal:
+        # PuLP drops zero coefficients, so a screen that leaves only zero-profit columns has no objective terms.
+        objective = 0.0
+    return SparseSolution(problem.econ, pulp.LpStatus[model.prob.status], solver, objective, long, short)
+
+
+def solve(problem, engine="pulp", mode="lp", screen=None, solver="cbc", time_limit=None, mip_gap=None,
+          threads=None, window=6, overlap=2, msg=0, telemetry=None):
+    """Solve a ``FlatBookProblem`` and return a ``SparseSolution`` over its routes.
+
+    ``engine`` is one of ``ENGINES``; only ``pulp`` solves ``mode="mip"``
+    and takes ``solver``/``time_limit``/``mip_gap``/``threads``. ``screen``
+    is a ``RouteScreen`` (or True to compute one) for the pulp and sparse
+    engines. The rolling engine solves ``window`` months at a time and its
+    solution's ``econ`` lists the committed routes only. Phase times and
+    solver statistics go to ``telemetry`` when one is given.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+    if mode not in SOLVE_MODES or (engine != "pulp" and mode != "lp"):
+        raise ValueError(f"the {engine} engine does not solve mode {mode!r}")
+    if screen is not None and screen is not False and engine not in ("pulp", "sparse"):
+        raise ValueError(f"screening applies to the pulp and sparse engines, not {engine}")
+    if telemetry is None:
+        from flatbook.telemetry import Telemetry
+
+        telemetry = Telemetry()
+    if screen is True:
+        from flatbook.screening import screen_routes
+
+        screen = screen_routes(problem.econ)
+    screen = screen or None
+    econ, cap, inventory_cap = problem.econ, problem.cap, problem.inventory_cap
+
+    if engine == "pulp":
+        limits = {"time_limit": time_limit, "mip_gap": mip_gap, "threads": threads}
+        return _solve_pulp(problem, mode, screen, solver, limits, msg, telemetry)
+    if engine == "network":
+        from flatbook.network import solve_network
+
+        with telemetry.phase("solve"):
+            solution = solve_network(econ, cap, inventory_cap)
+        telemetry.update(solver=solution.message)
+    elif engine == "rolling":
+        from flatbook.rolling import solve_rolling
+
+        definition = problem.to_definition()
+        with telemetry.phase("solve"):
+            solution = solve_rolling(definition, window, overlap)
+        telemetry.update(solver=solution.message, iterations=solution.iterations)
+    elif engine == "decomposed":
+        from flatbook.decomposition import solve_decomposed
+
+        with telemetry.phase("solve"):
+            solution = solve_decomposed(econ, cap, inventory_cap)
+        telemetry.update(solver=solution.message, iterations=solution.iterations)
+    else:
+        from flatbook.sparse import build_sparse_lp, solve_sparse_lp
+
+        with telemetry.phase("build"):
+            lp = build_sparse_lp(econ, cap, inventory_cap, screen=screen)
+        with telemetry.phase("solve"):
+            solution = solve_sparse_lp(lp)
+        telemetry.update(variables=lp.n_variables, constraints=lp.A_ub.shape[0] + lp.A_eq.shape[0],
+                         iterations=solution.iterations)
+    return solution
+
+
+class FlatBookReport:
+    """Trades and monthly ledger of one solution as columnar tables, with their console form."""
+
+    def __init__(self, status, objective, products, trades, ledger, total_long, total_short):
+        self.status = status
+        self.objective = objective
+        self.products = tuple(products)
+        self.trades = trades
+        self.ledger = ledger
+        self.total_long = total_long
+        self.total_short = total_short
+
+    def lines(self, trades=True, ledger=False):
+        """Yield the console report; ``trades`` and ``ledger`` toggle the per-row sections.
+
+        A run that found no solution reports its status only.
+        """
+        from flatbook.export import format_ledger, format_trades
+
+        yield f"Status: {self.status}"
+        if self.objective is None:
+            yield "No solution was found, so there is no profit, trade or ledger to report."
+            return
+        yield f"Total Maximum Profit: ${self.objective:,.2f}\n"
+        if trades:
+            yield "Executed Trades (Routes with nonzero volume):"
+            yield from format_trades(self.trades)
+        # Optional: Summary of flat-book volumes.
+        for pi, p in enumerate(self.products):
+            yield (f"{p} Summary: Total Long = {self.total_long[pi]:,.0f} barrels, "
+                   f"Total Short = {self.total_short[pi]:,.0f} barrels")
+        if ledger:
+            yield "\nMonthly Position Summary with Costs and P&L:"
+            yield from format_ledger(self.ledger)
+
+
+def report(problem, solution, threshold=1e-3):
+    """Build the ``FlatBookReport`` of ``solution``; volumes at or below ``threshold`` count as untraded."""
+    from flatbook.export import ledger_table, trade_table
+    from flatbook.ledger import position_ledger
+
+    econ = solution.econ
+    route_p = econ.route_index()[0]
+    P = len(econ.products)
+    ledger = position_ledger(econ, solution.long, solution.short, problem.storage_cost)
+    return FlatBookReport(solution.status, solution.objective, econ.products,
+                          trade_table(econ, solution.long, solution.short, threshold), ledger_table(ledger),
+                          np.bincount(route_p, weights=solution.long, minlength=P),
+                          np.bincount(route_p, weights=solution.short, minlength=P))
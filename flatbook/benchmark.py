@@ -0,0 +1,229 @@
+"""Scaling benchmarks for the flat-book model.
+
+Generates synthetic curves for a grid of month, location and product
+counts, times each phase of every engine and writes the results as JSON::
+
+    python -m flatbook.benchmark --months 8 24 --locations 2 4 --products 2 --output bench.json
+
+The PuLP + CBC path is the reference; every other engine reports its
+objective gap against it. The rolling engine solves ``--window`` months at
+a time, so its gap is the profit given up by the receding horizon.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from flatbook.definition import ModelDefinition, generate_routes
+from flatbook.ledger import position_ledger
+from flatbook.model import SOLVE_MODES
+
+ENGINES = ("pulp", "sparse", "network", "decomposed", "rolling")
+REFERENCE_ENGINE = "pulp"
+
+
+def synthetic_definition(n_months, n_locations, n_products, max_hold=None, seed=0):
+    """Random-walk price curves for every product at every location, with every link eligible."""
+    rng = np.random.default_rng(seed)
+    products = [f"P{i}" for i in range(n_products)]
+    locations = [f"L{i}" for i in range(n_locations)]
+    months = [f"T{i:03d}" for i in range(n_months)]
+
+    base = 70.0 + rng.normal(0.0, 2.0, (n_products, 1, 1))
+    basis = rng.normal(0.0, 0.5, (1, n_locations, 1))
+    walk = np.cumsum(rng.normal(0.02, 0.15, (n_products, n_locations, n_months)), axis=2)
+    buy = base + basis + walk
+    sale = buy + rng.normal(0.0, 0.1, buy.shape)
+
+    links = [(p, L, S) for p in range(n_products) for L in range(n_locations) for S in range(n_locations)]
+    link_product, link_location, link_option = (np.array(a) for a in zip(*links))
+    hold = n_months - 1 if max_hold is None else max_hold
+    daily_capacity = rng.choice([20000.0, 50000.0, 80000.0], n_products)
+    trading_days = rng.integers(19, 23, n_months)
+    return ModelDefinition(products, locations, locations, months, buy, sale, link_product, link_location,
+                           link_option, np.full(len(links), hold), link_location != link_option,
+                           daily_capacity, trading_days, 3000000, 0.2, 0.55)
+
+
+def _run_pulp(econ, d, mode, phases):
+    import pulp
+
+    from flatbook.model import build_pulp_model
+
+    model = build_pulp_model(econ, d.capacity, mode=mode, inventory_cap=d.inventory_cap, timings=phases)
+    start = time.perf_counter()
+    model.prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    phases["solve"] = time.perf_counter() - start
+    start = time.perf_counter()
+    long, short = model.route_volumes()
+    phases["extract"] = time.perf_counter() - start
+    sizes = {"variables": len(model.prob.variables()), "constraints": len(model.prob.constraints)}
+    return pulp.LpStatus[model.prob.status], pulp.value(model.prob.objective), long, short, sizes
+
+
+def _run_sparse(econ, d, mode, phases):
+    from flatbook.sparse import build_sparse_lp, solve_sparse_lp
+
+    start = time.perf_counter()
+    lp = build_sparse_lp(econ, d.capacity, d.inventory_cap)
+    phases["build"] = time.perf_counter() - start
+    start = time.perf_counter()
+    solution = solve_sparse_lp(lp)
+    phases["solve"] = time.perf_counter() - start
+    start = time.perf_counter()
+    solution.trades()
+    phases["extract"] = time.perf_counter() - start
+    sizes = {"variables": lp.n_variables, "constraints": lp.A_ub.shape[0] + lp.A_eq.shape[0]}
+    return solution.status, solution.objective, solution.long, solution.short, sizes
+
+
+def _run_network(econ, d, mode, phases):
+    from flatbook.network import solve_network
+
+    start = time.perf_counter()
+    solution = solve_network(econ, d.capacity, d.inventory_cap)
+    phases["solve"] = time.perf_counter() - start
+    start = time.perf_counter()
+    solution.trades()
+    phases["extract"] = time.perf_counter() - start
+    return solution.status, solution.objective, solution.long, solution.short, {"engine_used": solution.message}
+
+
+def _run_decomposed(econ, d, mode, phases):
+    from flatbook.decomposition import solve_decomposed
+
+    start = time.perf_counter()
+    solution = solve_decomposed(econ, d.capacity, d.inventory_cap)
+    phases["solve"] = time.perf_counter() - start
+    start = time.perf_counter()
+    solution.trades()
+    phases["extract"] = time.perf_counter() - start
+    return solution.status, solution.objective, solution.long, solution.short, {"engine_used": solution.message}
+
+
+def _run_rolling(econ, d, mode, phases, window=6, overlap=2):
+    from flatbook.rolling import solve_rolling
+
+    start = time.perf_counter()
+    solution = solve_rolling(d, window, overlap)
+    phases["solve"] = time.perf_counter() - start
+    start = time.perf_counter()
+    solution.trades()
+    # Committed routes are a subset of the full horizon's; scatter them onto its route ids for the ledger.
+    ids = np.searchsorted(econ._code(*econ.route_index()), econ._code(*solution.econ.route_index()))
+    long = np.zeros(econ.n_routes)
+    short = np.zeros(econ.n_routes)
+    long[ids] = solution.long
+    short[ids] = solution.short
+    phases["extract"] = time.perf_counter() - start
+    sizes = {"engine_used": solution.message, "window": window, "overlap": overlap,
+             "committed_routes": solution.econ.n_routes}
+    return solution.status, solution.objective, long, short, sizes
+
+
+RUNNERS = {"pulp": _run_pulp, "sparse": _run_sparse, "network": _run_network, "decomposed": _run_decomposed,
+           "rolling": _run_rolling}
+
+
+def run_case(engine, definition, mode="lp", window=6, overlap=2):
+    """Run one engine on one definition and return (status, objective, phases, sizes).
+
+    ``window`` and ``overlap`` apply to the rolling engine only.
+    """
+    phases = {}
+    start = time.perf_counter()
+    econ = generate_routes(definition)
+    phases["routes"] = time.perf_counter() - start
+    options = {"window": window, "overlap": overlap} if engine == "rolling" else {}
+    status, objective, long, short, sizes = RUNNERS[engine](econ, definition, mode, phases, **options)
+    start = time.perf_counter()
+    position_ledger(econ, long, short, definition.storage_cost)
+    phases["ledger"] = time.perf_counter() - start
+    sizes["routes"] = econ.n_routes
+    return status, objective, phases, sizes
+
+
+def run_benchmarks(months, locations, products, engines=ENGINES, mode="lp", max_hold=None, repeat=1,
+                   memory=True, seed=0, window=6, overlap=2):
+    """Benchmark every engine on every size combination and return the JSON-ready report."""
+    # Warm up imports (PuLP, SciPy) so the first timed case does not pay for them.
+    for engine in engines:
+        run_case(engine, synthetic_definition(2, 1, 1, seed=seed), mode, window, overlap)
+
+    results = []
+    for T in months:
+        for L in locations:
+            for P in products:
+                definition = synthetic_definition(T, L, P, max_hold=max_hold, seed=seed)
+                reference = None
+                ordered = sorted(engines, key=lambda e: e != REFERENCE_ENGINE)
+                for engine in ordered:
+                    best = None
+                    for _ in range(repeat):
+                        status, objective, phases, sizes = run_case(engine, definition, mode, window, overlap)
+                        if best is None or sum(phases.values()) < sum(best[2].values()):
+                            best = (status, objective, phases, sizes)
+                    status, objective, phases, sizes = best
+                    row = {"engine": engine, "mode": mode, "months": T, "locations": L, "products": P,
+                           "max_hold": max_hold, "status": status, "objective": objective,
+                           "phases": phases, "total_seconds": sum(phases.values()), **sizes}
+                    if engine == REFERENCE_ENGINE:
+                        reference = objective
+                    elif reference is not None and objective is not None:
+                        row["objective_gap_vs_reference"] = objective - reference
+                        if reference:
+                            row["relative_gap_vs_reference"] = (objective - reference) / abs(reference)
+                    if memory:
+                        tracemalloc.start()
+                        run_case(engine, definition, mode, window, overlap)
+                        row["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                    results.append(row)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "reference_engine": REFERENCE_ENGINE,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model build, solve and reporting phases.")
+    parser.add_argument("--months", type=int, nargs="+", default=[8, 16, 24])
+    parser.add_argument("--locations", type=int, nargs="+", default=[2])
+    parser.add_argument("--products", type=int, nargs="+", default=[2])
+    parser.add_argument("--max-hold", type=int, default=None, help="Longest buy-to-sell tenor in months.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--mode", choices=SOLVE_MODES, default="lp")
+    parser.add_argument("--window", type=int, default=6, help="Months per window for the rolling engine.")
+    parser.add_argument("--overlap", type=int, default=2,
+                        help="Months re-solved by the next window for the rolling engine.")
+    parser.add_argument("--repeat", type=int, default=1, help="Keep the fastest of this many runs.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.months, args.locations, args.products, args.engines, args.mode,
+                            args.max_hold, args.repeat, not args.no_memory, args.seed, args.window,
+                            args.overlap)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Bump when the stored layout or the meaning of a cached solution changes.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _canonical(value):
+    # Reduce inputs to JSON-stable values; floats use repr so every bit counts.
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"dtype": str(value.dtype), "shape": list(value.shape), "sha256": digest}
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, "__dict__"):
+        return {"type": type(value).__name__, "fields": _canonical(vars(value))}
+    raise TypeError(f"Cannot hash input of type {type(value).__name__}")
+
+
+def input_key(**inputs):
+    """Return a stable SHA-256 key over every optimization input and solver setting.
+
+    Dict order is kept (month order matters); any change to a price,
+    differential, forecast adjustment, capacity, cost, inventory cap or
+    solver setting produces a different key.
+    """
+    payload = json.dumps({"version": CACHE_VERSION, "inputs": _canonical(inputs)}, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CachedSolution:
+    """A solution read back from the cache, aligned with the route order it was stored with."""
+
+    def __init__(self, status, objective, long, short):
+        self.status = status
+        self.objective = objective
+        self.long = long
+        self.short = short
+
+
+class SolutionCache:
+    """Solution vectors and summaries on local disk, keyed by ``input_key``.
+
+    Each entry is one ``.npz`` file. Reads refresh the file's modification
+    time, and writes evict the least recently used entries until the
+    directory fits in ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """Return the ``CachedSolution`` stored under ``key``, or None."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                summary = json.loads(str(data["summary"]))
+                long, short = data["long"], data["short"]
+        except (OSError, KeyError, ValueError):
+            return None
+        os.utime(path)
+        return CachedSolution(summary["status"], summary["objective"], long, short)
+
+    def put(self, key, status, objective, long, short):
+        """Store a solution under ``key`` and evict old entries past the size bound."""
+        summary = json.dumps({"status": status, "objective": objective})
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, long=np.asarray(long, dtype=float), short=np.asarray(short, dtype=float),
+                     summary=np.array(summary))
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
@@ -0,0 +1,212 @@
+import argparse
+
+import numpy as np
+
+from flatbook.api import ENGINES, build_model, report, solve
+from flatbook.export import EXPORT_FORMATS
+from flatbook.model import SOLVE_MODES
+from flatbook.solvers import SOLVER_BACKENDS
+
+
+def build_parser(ledger=False, prog=None):
+    """Return the command-line parser; ``ledger`` sets whether the monthly summary prints by default."""
+    parser = argparse.ArgumentParser(prog=prog, description="Flat-book multi-route trading optimization.")
+    parser.add_argument("--mode", choices=SOLVE_MODES, default="lp",
+                        help="lp solves the continuous model; mip adds the yplus/yminus binaries.")
+    parser.add_argument("--engine", choices=ENGINES, default="pulp",
+                        help="pulp builds PuLP expressions and runs CBC; sparse builds CSR rows and runs HiGHS "
+                             "in-process; network solves the per-product transportation problem, falling back to "
+                             "sparse if InvCap binds; decomposed solves each product in its own worker and prices "
+                             "the shared InvCap rows; rolling solves --window months at a time and commits all but "
+                             "the last --overlap.")
+    parser.add_argument("--solver", choices=SOLVER_BACKENDS + ("race",), default="cbc",
+                        help="PuLP backend for the pulp engine; race runs every installed backend and keeps the "
+                             "first optimum.")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS", help="Solver time limit (pulp engine).")
+    parser.add_argument("--mip-gap", type=float, metavar="GAP", help="Relative MIP gap to stop at (pulp engine).")
+    parser.add_argument("--threads", type=int, help="Solver threads (pulp engine; GLPK ignores it).")
+    parser.add_argument("--window", type=int, default=6, help="Months per window for the rolling engine.")
+    parser.add_argument("--overlap", type=int, default=2,
+                        help="Months re-solved by the next window for the rolling engine.")
+    parser.add_argument("--data", metavar="DIR",
+                        help="Load the model from curves.csv, routes.csv and costs.csv in DIR instead of the "
+                             "shipped inputs.")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Reuse solutions stored in DIR when every input and solver setting matches.")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="Append a JSON run record (phase times, sizes, solver stats) to PATH, or - for stderr.")
+    parser.add_argument("--profile", action="store_true", help="Run the model build under cProfile in the run record.")
+    parser.add_argument("--trace-memory", action="store_true", help="Record peak traced memory of the model build.")
+    parser.add_argument("--screen", action="store_true",
+                        help="Drop dominated and unprofitable route directions before building (pulp and sparse "
+                             "engines).")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="Report shadow prices and ranging of the binding constraints (LP only).")
+    parser.add_argument("--risk", type=int, metavar="PATHS",
+                        help="Simulate the chosen book over PATHS correlated price paths and report VaR/CVaR by "
+                             "route.")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="Keep the model hot and answer JSON price updates and what-ifs on HOST:PORT or "
+                             "unix:PATH.")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Write trades, the monthly ledger and the run record to DIR as columnar files.")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="csv",
+                        help="File format for --export; parquet needs pyarrow.")
+    parser.add_argument("--ledger", action=argparse.BooleanOptionalAction, default=ledger,
+                        help="Print the monthly position and P&L summary.")
+    parser.add_argument("--quiet", action="store_true", help="Skip the per-trade and monthly console listing.")
+    parser.add_argument("--check-modes", action="store_true",
+                        help="Solve both modes and check they report the same objective.")
+    return parser
+
+
+def _validate(parser, args):
+    if args.engine != "pulp" and args.mode != "lp":
+        parser.error(f"the {args.engine} engine only solves the LP mode")
+    if args.engine != "pulp" and (args.solver != "cbc" or args.time_limit or args.mip_gap is not None or args.threads):
+        parser.error("--solver, --time-limit, --mip-gap and --threads apply to the pulp engine")
+    if args.engine == "pulp" and args.solver != "race":
+        from flatbook.solvers import available_backends, solver_command
+
+        if not solver_command(args.solver).available():
+            parser.error(f"the {args.solver} solver is not installed; available: "
+                         f"{', '.join(available_backends()) or 'none'}")
+    if args.engine == "rolling" and (args.cache or args.sensitivity):
+        parser.error("the rolling engine reports committed trades only; it does not support --cache or --sensitivity")
+    if args.engine == "rolling" and not 0 <= args.overlap < args.window:
+        parser.error("--overlap must be at least 0 and less than --window")
+    if args.screen and args.engine not in ("pulp", "sparse"):
+        parser.error(f"--screen applies to the pulp and sparse engines, not {args.engine}")
+    if args.sensitivity and args.mode != "lp":
+        parser.error("--sensitivity needs the LP mode; duals are not meaningful with the yplus/yminus binaries")
+    if args.risk is not None and (args.data or args.engine == "rolling" or args.risk < 1):
+        parser.error("--risk simulates the shipped curves and needs a positive path count; it does not take --data "
+                     "or the rolling engine")
+    if args.serve and args.data:
+        parser.error("--serve keeps the shipped inputs hot in HiGHS; it does not take --data")
+
+
+def main(argv=None, ledger=False, script=None, prog=None):
+    """Run the flat-book optimization from the command line and return the exit status.
+
+    ``ledger`` is the default of ``--ledger``; ``script`` names the entry
+    point in the telemetry record and ``prog`` in the usage text.
+    """
+    parser = build_parser(ledger, prog)
+    args = parser.parse_args(argv)
+    _validate(parser, args)
+
+    if args.serve:
+        from flatbook.incremental import IncrementalModel
+        from flatbook.service import run_service
+
+        problem = build_model()
+        run_service(IncrementalModel(**problem.curve_inputs(), cap=problem.cap), args.serve)
+        return 0
+
+    from flatbook.telemetry import Telemetry, jsonl_sink
+
+    telemetry = Telemetry([jsonl_sink(args.telemetry)] if args.telemetry else [], profile=args.profile,
+                          trace_memory=args.trace_memory)
+    telemetry.update(script=script or "flatbook", engine=args.engine, mode=args.mode, data=args.data)
+
+    with telemetry.phase("economics"):
+        problem = build_model(args.data)
+    econ = problem.econ
+    telemetry.update(routes=econ.n_routes)
+
+    if args.check_modes:
+        from flatbook.model import compare_modes
+
+        lp_obj, mip_obj, match = compare_modes(econ, problem.cap, problem.inventory_cap)
+        print(f"LP objective:  ${lp_obj:,.2f}")
+        print(f"MIP objective: ${mip_obj:,.2f}")
+        print("Modes agree." if match else "Modes DISAGREE.")
+        return 0 if match else 1
+
+    screen = None
+    if args.screen:
+        from flatbook.screening import screen_routes
+
+        # Removed directions cannot be needed at the optimum, so the objective is unchanged.
+        with telemetry.phase("screen"):
+            screen = screen_routes(econ)
+        telemetry.update(screen=screen.summary())
+        print(f"Screening removed {screen.removed:,} of {screen.n_variables:,} route variables "
+              f"({screen.dominated_long + screen.dominated_short:,} dominated, "
+              f"{screen.unprofitable_long + screen.unprofitable_short:,} unprofitable).\n")
+
+    # Build and solve the model, then read back one long and one short volume per route.
+    solution = None
+    if args.cache:
+        from flatbook.cache import SolutionCache, input_key
+        from flatbook.sparse import SparseSolution
+
+        cache = SolutionCache(args.cache)
+        cache_key = input_key(model=problem.definition if args.data else problem.inputs,
+                              inventory_cap=problem.inventory_cap, engine=args.engine, mode=args.mode,
+                              screen=args.screen, solver=args.solver, time_limit=args.time_limit,
+                              mip_gap=args.mip_gap)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            solution = SparseSolution(econ, cached.status, "cache", cached.objective, cached.long, cached.short)
+    telemetry.update(cache_hit=solution is not None)
+
+    if solution is None:
+        solution = solve(problem, args.engine, args.mode, screen=screen, solver=args.solver,
+                         time_limit=args.time_limit, mip_gap=args.mip_gap, threads=args.threads,
+                         window=args.window, overlap=args.overlap, msg=1, telemetry=telemetry)
+        if args.cache and solution.status == "Optimal":
+            cache.put(cache_key, solution.status, solution.objective, solution.long, solution.short)
+    long_vol, short_vol = solution.long, solution.short
+
+    telemetry.update(status=solution.status, objective=solution.objective,
+                     nonzero_routes=int(np.count_nonzero((long_vol > 1e-3) | (short_vol > 1e-3))))
+
+    # Results are built as columnar tables; the console lines below are one formatter over them.
+    with telemetry.phase("report"):
+        result = report(problem, solution)
+    for line in result.lines(trades=not args.quiet, ledger=args.ledger and not args.quiet):
+        print(line)
+    if solution.objective is None:
+        telemetry.emit()
+        return 1
+
+    if args.risk:
+        from flatbook.risk import simulate_pnl
+
+        # Route volumes stay fixed; only the realized prices move along each path.
+        with telemetry.phase("risk"):
+            risk = simulate_pnl(long_vol, short_vol, **problem.curve_inputs(), n_paths=args.risk)
+        telemetry.update(risk={"paths": risk.n_paths, "expected": risk.expected, "var": risk.var,
+                               "cvar": risk.cvar})
+        print(f"\nP&L at Risk over {risk.n_paths:,} paths ({risk.confidence:.0%} confidence):")
+        print(f"  Expected P&L = ${risk.expected:,.2f}; VaR = ${risk.var:,.2f}; CVaR = ${risk.cvar:,.2f}")
+        print("  Largest CVaR contributions:")
+        for row in list(risk.rows())[:5]:
+            print(f"    {row['product']} {row['buy_month']} at {row['buy_location']} -> {row['sell_month']} via "
+                  f"{row['sell_option']}: ${row['cvar_contribution']:,.2f} (std ${row['std']:,.2f})")
+
+    if args.sensitivity:
+        from flatbook.sensitivity import sensitivity_report
+
+        # One extra LP solve prices every cap change that stays inside its ranging interval.
+        with telemetry.phase("sensitivity"):
+            sensitivity = sensitivity_report(econ, problem.cap, problem.inventory_cap)
+        print("\nBinding Constraints (shadow price per barrel; rhs range where it holds):")
+        for row in sensitivity.rows(binding_only=True):
+            print(f"  {row['name']}: ${row['shadow_price']:.4f}/bbl at {row['rhs']:,.0f} "
+                  f"(valid {row['rhs_lower']:,.0f} to {row['rhs_upper']:,.0f})")
+
+    if args.export:
+        from flatbook.export import write_results
+
+        with telemetry.phase("export"):
+            write_results(args.export, result.trades, result.ledger,
+                          dict(telemetry.record, months=problem.months, products=list(econ.products),
+                               inventory_cap=problem.inventory_cap, storage_cost=problem.storage_cost),
+                          args.export_format)
+        print(f"\nWrote {len(result.trades):,} trades and {len(result.ledger):,} ledger rows to {args.export}")
+
+    telemetry.emit()
+    return 0
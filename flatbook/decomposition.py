@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from flatbook.model import INVENTORY_CAP
+from flatbook.sparse import LINPROG_STATUS, SparseSolution, build_sparse_lp
+
+# Per-process state set by _init_worker: one product subproblem per entry.
+_SUBPROBLEMS = None
+
+
+def product_subproblems(lp):
+    """Split a ``SparseLP`` into one independent LP per product.
+
+    Each subproblem keeps its product's ``xplus``/``xminus`` columns, its
+    ``BuyCap``/``SellCap`` rows and its ``FlatBook`` row. The ``InvCap``
+    rows are the only ones products share; they are kept per product as
+    ``A_inv`` so the master problem can price storage.
+    """
+    econ = lp.econ
+    route_p = econ.route_index()[0]
+    P, T, R = len(econ.products), len(econ.months), lp.n_routes
+    A_ub = lp.A_ub.tocsc()
+    A_eq = lp.A_eq.tocsc()
+    subproblems = []
+    for pi in range(P):
+        routes = np.nonzero(route_p == pi)[0]
+        cols = np.concatenate([routes, routes + R])
+        cap_rows = np.concatenate([pi * T + np.arange(T), P * T + pi * T + np.arange(T)])
+        sub_ub = A_ub[:, cols]
+        subproblems.append({
+            "product": pi, "routes": routes, "c": lp.c[cols],
+            "A_ub": sub_ub[cap_rows].tocsr(), "b_ub": lp.b_ub[cap_rows],
+            "A_eq": A_eq[pi][:, cols].tocsr(), "b_eq": lp.b_eq[pi:pi + 1],
+            "A_inv": sub_ub[2 * P * T:].tocsr(),
+        })
+    return subproblems
+
+
+def _init_worker(subproblems):
+    global _SUBPROBLEMS
+    _SUBPROBLEMS = subproblems
+
+
+def _price_product(job):
+    """Solve one product's subproblem with storage charged at ``prices`` per barrel-month."""
+    from scipy.optimize import linprog
+
+    pi, prices = job
+    sub = _SUBPROBLEMS[pi]
+    c = sub["c"] + sub["A_inv"].T @ prices
+    res = linprog(c, A_ub=sub["A_ub"], b_ub=sub["b_ub"], A_eq=sub["A_eq"], b_eq=sub["b_eq"],
+                  bounds=(0, None), method="highs")
+    return pi, LINPROG_STATUS.get(res.status, "Undefined"), res.x
+
+
+def _master(profits, loads, owners, inv_cap, P):
+    """Restricted master: best convex combination of each product's proposals under ``InvCap``."""
+    from scipy.optimize import linprog
+
+    K = len(profits)
+    convexity = np.zeros((P, K))
+    convexity[owners, np.arange(K)] = 1.0
+    res = linprog(-np.asarray(profits), A_ub=np.column_stack(loads), b_ub=inv_cap,
+                  A_eq=convexity, b_eq=np.ones(P), bounds=(0, None), method="highs")
+    # HiGHS reports minimize-sense marginals; flip them to profit per unit of capacity.
+    return res, -res.ineqlin.marginals, -res.eqlin.marginals
+
+
+def solve_decomposed(econ, cap, inventory_cap=INVENTORY_CAP, workers=None, tol=1e-6, max_rounds=100):
+    """Solve the flat-book LP by Dantzig-Wolfe decomposition over products.
+
+    Every round solves each product's subproblem in its own worker with the
+    ``InvCap`` rows priced at the master's current storage duals, then adds
+    the proposals to a small master LP that mixes them under the shared
+    storage caps. It stops when no product can propose a column worth more
+    than its convexity dual, at which point the mixed solution is optimal
+    for the monolithic LP. The first round prices storage at zero, so a
+    case where storage never binds finishes in the second round. A
+    product with no eligible routes keeps only the empty book and is
+    never sent to a worker.
+    ``workers`` defaults to one per product up to the core count;
+    ``workers=1`` solves in-process.
+    """
+    lp = build_sparse_lp(econ, cap, inventory_cap)
+    subproblems = product_subproblems(lp)
+    P = len(subproblems)
+    inv_cap = lp.b_ub[2 * P * len(econ.months):]
+
+    # Seed the master with the empty book, which is feasible for every product.
+    profits, loads, owners, points = [], [], [], []
+    for sub in subproblems:
+        profits.append(0.0)
+        loads.append(np.zeros(len(inv_cap)))
+        owners.append(sub["product"])
+        points.append(np.zeros(len(sub["c"])))
+
+    priced = [sub["product"] for sub in subproblems if len(sub["routes"])]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(priced)))
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(subproblems,)) if workers > 1 else None
+    if pool is None:
+        _init_worker(subproblems)
+    res = None
+    status, message = "Not Solved", f"decomposition: no convergence in {max_rounds} rounds"
+    try:
+        for rounds in range(1, max_rounds + 1):
+            res, prices, convexity_duals = _master(profits, loads, np.asarray(owners), inv_cap, P)
+            if res.x is None:
+                status, message = LINPROG_STATUS.get(res.status, "Undefined"), f"decomposition: {res.message}"
+                break
+            jobs = [(pi, prices) for pi in priced]
+            results = list(pool.map(_price_product, jobs)) if pool else [_price_product(job) for job in jobs]
+            failed = [sub_status for _, sub_status, x in results if x is None]
+            if failed:
+                status, message = failed[0], f"decomposition: product subproblem {failed[0]}"
+                break
+            # A proposal enters only if it beats the product's current mix at these storage prices.
+            added = 0
+            for pi, _, x in results:
+                sub = subproblems[pi]
+                profit = float(-sub["c"] @ x)
+                load = sub["A_inv"] @ x
+                if profit - prices @ load - convexity_duals[pi] > tol * max(1.0, abs(profit)):
+                    profits.append(profit)
+                    loads.append(load)
+                    owners.append(pi)
+                    points.append(x)
+                    added += 1
+            if not added:
+                status, message = "Optimal", f"decomposition: {rounds} rounds, {len(profits)} columns"
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Map the mixed proposals back onto the full route arrays.
+    R = lp.n_routes
+    long = np.zeros(R)
+    short = np.zeros(R)
+    weights = res.x if status == "Optimal" else np.zeros(0)
+    for weight, pi, x in zip(weights, owners, points):
+        if weight > 0:
+            routes = subproblems[pi]["routes"]
+            n = len(routes)
+            long[routes] += weight * x[:n]
+            short[routes] += weight * x[n:]
+    objective = float(-res.fun) if status == "Optimal" else None
+    return SparseSolution(econ, status, message, objective, long, short, lp, rounds)
@@ -0,0 +1,53 @@
+import copy
+
+# Define the months.
+MONTHS = ("May", "June", "July", "August", "September", "October", "November", "December")
+
+# Price data for WTI (physical prices).
+MIDLAND_PRICE = {
+    "May": 70.00, "June": 70.35, "July": 70.70, "August": 70.90,
+    "September": 70.90, "October": 70.90, "November": 70.90, "December": 70.90
+}
+HOUSTON_PRICE = {
+    "May": 70.65, "June": 71.45, "July": 71.55, "August": 71.35,
+    "September": 71.25, "October": 71.25, "November": 71.25, "December": 71.25
+}
+
+# Forecast adjustments for Houston prices (in dollars).
+FORECAST_ADJUSTMENT = {m: 0.0 for m in MONTHS}
+
+# For WTS, define sour differentials (in dollars).
+DELTA_M = {
+    "May": 1.00, "June": 1.00, "July": 0.70, "August": 0.70,
+    "September": 0.70, "October": 0.70, "November": 0.70, "December": 0.70
+}
+DELTA_H = {
+    "May": 0.75, "June": 0.75, "July": 0.90, "August": 0.90,
+    "September": 0.90, "October": 0.90, "November": 0.90, "December": 0.90
+}
+
+# Trading days per month and daily capacity.
+TRADING_DAYS = {
+    "May": 20, "June": 21, "July": 22, "August": 21,
+    "September": 21, "October": 22, "November": 21, "December": 21
+}
+DAILY_CAPACITY = {"WTI": 80000, "WTS": 20000}
+
+# Cost parameters.
+PIPELINE_FIXED = 0.55    # Fixed pipeline cost per barrel.
+STORAGE_COST = 0.2       # Storage cost per barrel per month for long trades.
+
+
+def monthly_capacity(months, trading_days, daily_capacity):
+    """Monthly capacity for each product: ``daily_capacity * trading_days``, as ``cap[p][m]``."""
+    return {p: {m: daily * trading_days[m] for m in months} for p, daily in daily_capacity.items()}
+
+
+def default_inputs():
+    """Return a fresh copy of the shipped curve inputs, keyed by their ``route_economics`` names."""
+    return copy.deepcopy({
+        "months": list(MONTHS), "midland_price": MIDLAND_PRICE, "houston_price": HOUSTON_PRICE,
+        "Delta_M": DELTA_M, "Delta_H": DELTA_H, "forecast_adjustment": FORECAST_ADJUSTMENT,
+        "trading_days": TRADING_DAYS, "daily_capacity": DAILY_CAPACITY,
+        "pipeline_fixed": PIPELINE_FIXED, "storage_cost": STORAGE_COST,
+    })
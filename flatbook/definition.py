@@ -0,0 +1,232 @@
+import csv
+import os
+
+import numpy as np
+
+from flatbook.economics import (BUY_LOCATIONS, CARRY_CREDIT, PIPELINE_RATE, PRODUCTS, SELL_OPTIONS,
+                                SparseRouteEconomics, physical_curves)
+from flatbook.model import INVENTORY_CAP
+
+# File names inside a model definition directory.
+CURVES_FILE = "curves.csv"
+ROUTES_FILE = "routes.csv"
+COSTS_FILE = "costs.csv"
+
+
+class ModelDefinition:
+    """Products, locations, months, prices, route eligibility and costs for one model.
+
+    ``buy_price`` is [product, buy location, month] and ``sale_price`` is
+    [product, sell option, month]; NaN marks a point where the product
+    cannot be bought or sold in that month. Each eligible link ``k`` lets
+    ``link_product[k]`` be bought at ``link_location[k]`` and sold via
+    ``link_option[k]`` up to ``link_max_hold[k]`` months later, paying
+    pipeline cost when ``link_piped[k]`` is set. ``capacity`` is
+    ``daily_capacity`` [product] times ``trading_days`` [month], and
+    ``inventory_cap`` holds one storage limit per buy location.
+    """
+
+    def __init__(self, products, buy_locations, sell_options, months, buy_price, sale_price,
+                 link_product, link_location, link_option, link_max_hold, link_piped, daily_capacity,
+                 trading_days, inventory_cap, storage_cost, pipeline_fixed, pipeline_rate=PIPELINE_RATE,
+                 carry_credit=CARRY_CREDIT):
+        self.products = tuple(products)
+        self.buy_locations = tuple(buy_locations)
+        self.sell_options = tuple(sell_options)
+        self.months = tuple(months)
+        self.buy_price = np.asarray(buy_price, dtype=float)
+        self.sale_price = np.asarray(sale_price, dtype=float)
+        self.link_product = np.asarray(link_product, dtype=np.intp)
+        self.link_location = np.asarray(link_location, dtype=np.intp)
+        self.link_option = np.asarray(link_option, dtype=np.intp)
+        self.link_max_hold = np.minimum(np.asarray(link_max_hold, dtype=np.intp), len(self.months) - 1)
+        self.link_piped = np.asarray(link_piped, dtype=bool)
+        self.daily_capacity = np.asarray(daily_capacity, dtype=float)
+        self.trading_days = np.asarray(trading_days, dtype=float)
+        self.capacity = np.outer(self.daily_capacity, self.trading_days)
+        self.inventory_cap = np.broadcast_to(np.asarray(inventory_cap, dtype=float),
+                                             (len(self.buy_locations),)).copy()
+        self.storage_cost = storage_cost
+        self.pipeline_fixed = pipeline_fixed
+        self.pipeline_rate = pipeline_rate
+        self.carry_credit = carry_credit
+
+
+def definition_from_curves(months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                           trading_days, daily_capacity, pipeline_fixed, storage_cost,
+                           inventory_cap=INVENTORY_CAP):
+    """Build the definition of the shipped WTI/WTS, M/H -> M/H/R model from the script inputs."""
+    buy, sale = physical_curves(months, midland_price, houston_price, Delta_M, Delta_H,
+                                forecast_adjustment)
+    links = [(p, L, S) for p in range(len(PRODUCTS)) for L in range(len(BUY_LOCATIONS))
+             for S in range(len(SELL_OPTIONS))]
+    link_product, link_location, link_option = (np.array(a) for a in zip(*links))
+    piped = np.array(BUY_LOCATIONS)[link_location] != np.array(SELL_OPTIONS)[link_option]
+    return ModelDefinition(PRODUCTS, BUY_LOCATIONS, SELL_OPTIONS, months, buy, sale, link_product,
+                           link_location, link_option, np.full(len(links), len(months) - 1), piped,
+                           [daily_capacity[p] for p in PRODUCTS], [trading_days[m] for m in months],
+                           inventory_cap, storage_cost, pipeline_fixed)
+
+
+def generate_routes(definition):
+    """Enumerate eligible routes and their economics without building the dense tensor.
+
+    A route exists for every link and every (buy month, sell month) pair
+    within the link's maximum hold where the product has a buy price at the
+    location and a sale price at the option. Work and memory scale with the
+    number of eligible routes, not with products x locations x options x
+    months squared.
+    """
+    d = definition
+    T = len(d.months)
+    chunks = []
+    for hold in range(int(d.link_max_hold.max(initial=-1)) + 1):
+        links = np.nonzero(d.link_max_hold >= hold)[0]
+        m = np.arange(T - hold)
+        k = np.repeat(links, len(m))
+        m = np.tile(m, len(links))
+        n = m + hold
+        p, l, s = d.link_product[k], d.link_location[k], d.link_option[k]
+        ok = np.isfinite(d.buy_price[p, l, m]) & np.isfinite(d.sale_price[p, s, n])
+        chunks.append((p[ok], l[ok], s[ok], m[ok], n[ok], k[ok]))
+    p, l, s, m, n, k = (np.concatenate(a) if chunks else np.zeros(0, dtype=np.intp) for a in zip(*chunks))
+
+    order = np.lexsort((n, m, s, l, p))
+    p, l, s, m, n, k = p[order], l[order], s[order], m[order], n[order], k[order]
+
+    buy = d.buy_price[p, l, m]
+    outlay = buy + np.where(d.link_piped[k], d.pipeline_fixed + d.pipeline_rate * buy, 0.0)
+    sale = d.sale_price[p, s, n]
+    hold = n - m
+    margin = sale - outlay
+    long = np.where(hold > 0, margin - d.storage_cost * hold + d.carry_credit, margin)
+    short = outlay - sale
+    return SparseRouteEconomics(d.products, d.buy_locations, d.sell_options, d.months,
+                                (p, l, s, m, n), long, short)
+
+
+def _read_rows(path):
+    with open(path, newline="") as f:
+        return [{k.strip(): (v or "").strip() for k, v in row.items()} for row in csv.DictReader(f)]
+
+
+def _ordered(values):
+    return list(dict.fromkeys(values))
+
+
+def load_definition(directory):
+    """Load a model definition from ``curves.csv``, ``routes.csv`` and ``costs.csv`` in ``directory``.
+
+    ``curves.csv`` has ``product,point,month,buy_price,sell_price`` rows; a
+    blank price means the product cannot be bought (or sold) at that point
+    in that month. Product and month order follow first appearance.
+    ``routes.csv`` has ``product,buy_location,sell_option,max_hold,pipeline``
+    rows; ``*`` in the product column applies a row to every product, a
+    blank ``max_hold`` means no tenor limit and ``pipeline`` is 1 when the
+    link pays pipeline cost. ``costs.csv`` has ``parameter,key,value`` rows
+    for ``storage_cost``, ``pipeline_fixed``, ``pipeline_rate``,
+    ``carry_credit``, ``daily_capacity`` (keyed by product),
+    ``trading_days`` (keyed by month) and ``inventory_cap`` (keyed by
+    location, or blank for all locations).
+    """
+    curves = _read_rows(os.path.join(directory, CURVES_FILE))
+    routes = _read_rows(os.path.join(directory, ROUTES_FILE))
+    costs = _read_rows(os.path.join(directory, COSTS_FILE))
+
+    products = _ordered(row["product"] for row in curves)
+    months = _ordered(row["month"] for row in curves)
+    buy_locations = _ordered(row["buy_location"] for row in routes)
+    sell_options = _ordered(row["sell_option"] for row in routes)
+    p_idx = {p: i for i, p in enumerate(products)}
+    l_idx = {L: i for i, L in enumerate(buy_locations)}
+    s_idx = {S: i for i, S in enumerate(sell_options)}
+    t_idx = {m: i for i, m in enumerate(months)}
+
+    T = len(months)
+    buy_price = np.full((len(products), len(buy_locations), T), np.nan)
+    sale_price = np.full((len(products), len(sell_options), T), np.nan)
+    for row in curves:
+        p, t, point = p_idx[row["product"]], t_idx[row["month"]], row["point"]
+        if row["buy_price"]:
+            if point not in l_idx:
+                raise ValueError(f"{CURVES_FILE}: buy price at {point!r}, which no route buys from")
+            buy_price[p, l_idx[point], t] = float(row["buy_price"])
+        if row["sell_price"] and point in s_idx:
+            sale_price[p, s_idx[point], t] = float(row["sell_price"])
+
+    links = []
+    for row in routes:
+        targets = products if row["product"] == "*" else [row["product"]]
+        max_hold = int(row["max_hold"]) if row["max_hold"] else T - 1
+        for p in targets:
+            links.append((p_idx[p], l_idx[row["buy_location"]], s_idx[row["sell_option"]], max_hold,
+                          row["pipeline"] not in ("", "0")))
+    link_product, link_location, link_option, link_max_hold, link_piped = (np.array(a) for a in zip(*links))
+
+    params = {}
+    daily_capacity = {}
+    trading_days = {}
+    inventory_cap = np.full(len(buy_locations), float(INVENTORY_CAP))
+    for row in costs:
+        name, key, value = row["parameter"], row["key"], float(row["value"])
+        if name == "daily_capacity":
+            daily_capacity[key] = value
+        elif name == "trading_days":
+            trading_days[key] = value
+        elif name == "inventory_cap":
+            if key:
+                inventory_cap[l_idx[key]] = value
+            else:
+                inventory_cap[:] = value
+        elif name in ("storage_cost", "pipeline_fixed", "pipeline_rate", "carry_credit"):
+            params[name] = value
+        else:
+            raise ValueError(f"{COSTS_FILE}: unknown parameter {name!r}")
+    missing = [name for name in ("storage_cost", "pipeline_fixed") if name not in params]
+    if missing:
+        raise ValueError(f"{COSTS_FILE}: missing {', '.join(missing)}")
+    return ModelDefinition(products, buy_locations, sell_options, months, buy_price, sale_price,
+                           link_product, link_location, link_option, link_max_hold, link_piped,
+                           [daily_capacity[p] for p in products], [trading_days[m] for m in months],
+                           inventory_cap, **params)
+
+
+def write_definition(definition, directory):
+    """Write ``definition`` as the three CSV files read by ``load_definition``."""
+    d = definition
+    os.makedirs(directory, exist_ok=True)
+    points = _ordered(d.buy_locations + d.sell_options)
+    with open(os.path.join(directory, CURVES_FILE), "w", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(["product", "point", "month", "buy_price", "sell_price"])
+        for pi, p in enumerate(d.products):
+            for point in points:
+                for t, m in enumerate(d.months):
+                    buy = d.buy_price[pi, d.buy_locations.index(point), t] if point in d.buy_locations else np.nan
+                    sale = d.sale_price[pi, d.sell_options.index(point), t] if point in d.sell_options else np.nan
+                    w.writerow([p, point, m, "" if np.isnan(buy) else repr(float(buy)),
+                                "" if np.isnan(sale) else repr(float(sale))])
+    with open(os.path.join(directory, ROUTES_FILE), "w", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(["product", "buy_location", "sell_option", "max_hold", "pipeline"])
+        for k in range(len(d.link_product)):
+            max_hold = int(d.link_max_hold[k])
+            w.writerow([d.products[d.link_product[k]], d.buy_locations[d.link_location[k]],
+                        d.sell_options[d.link_option[k]], "" if max_hold >= len(d.months) - 1 else max_hold,
+                        int(d.link_piped[k])])
+    with open(os.path.join(directory, COSTS_FILE), "w", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(["parameter", "key", "value"])
+        for name in ("storage_cost", "pipeline_fixed", "pipeline_rate", "carry_credit"):
+            w.writerow([name, "", _number(getattr(d, name))])
+        for p, value in zip(d.products, d.daily_capacity):
+            w.writerow(["daily_capacity", p, _number(value)])
+        for m, value in zip(d.months, d.trading_days):
+            w.writerow(["trading_days", m, _number(value)])
+        for L, value in zip(d.buy_locations, d.inventory_cap):
+            w.writerow(["inventory_cap", L, _number(value)])
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else repr(value)
@@ -0,0 +1,239 @@
+import numpy as np
+
+# Default product, buy location and sell option labels.
+PRODUCTS = ("WTI", "WTS")
+BUY_LOCATIONS = ("M", "H")
+SELL_OPTIONS = ("M", "H", "R")
+
+# Curve inputs (partial {month: value} dicts) and scalar cost inputs that only move objective coefficients.
+CURVE_FIELDS = ("midland_price", "houston_price", "Delta_M", "Delta_H", "forecast_adjustment")
+COST_FIELDS = ("pipeline_fixed", "storage_cost")
+
+# Variable pipeline cost as a fraction of the effective buying price.
+PIPELINE_RATE = 0.002
+# Credit added to long trades held for at least one month.
+CARRY_CREDIT = 0.06
+# Refinery premium over forecast Houston WTI for WTI, and refinery discount for WTS.
+REFINERY_PREMIUM_WTI = 0.05
+REFINERY_DISCOUNT_WTS = 0.62
+
+# One record per route: integer codes into the product, location, option and month labels.
+ROUTE_DTYPE = np.dtype([("product", np.int32), ("location", np.int32), ("option", np.int32),
+                        ("buy_month", np.int32), ("sell_month", np.int32)])
+
+
+def route_registry(product, location, option, buy_month, sell_month):
+    """Pack route index arrays into one ``ROUTE_DTYPE`` array; a route's id is its position."""
+    routes = np.empty(len(product), dtype=ROUTE_DTYPE)
+    routes["product"] = product
+    routes["location"] = location
+    routes["option"] = option
+    routes["buy_month"] = buy_month
+    routes["sell_month"] = sell_month
+    return routes
+
+
+def _curve(values, months):
+    return np.array([values[m] for m in months], dtype=float)
+
+
+def physical_curves(months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment):
+    """Return the buy price [product, location, month] and sale price [product, option, month] arrays."""
+    mid = _curve(midland_price, months)
+    hou = _curve(houston_price, months)
+    d_m = _curve(Delta_M, months)
+    d_h = _curve(Delta_H, months)
+    adj = _curve(forecast_adjustment, months)
+
+    houston_wti = hou + adj
+    houston_wts = (hou - d_h) + adj
+
+    buy = np.stack([
+        np.stack([mid, hou]),                # WTI at M, H
+        np.stack([mid - d_m, hou - d_h]),    # WTS at M, H
+    ])
+    sale = np.stack([
+        np.stack([mid, houston_wti, houston_wti + REFINERY_PREMIUM_WTI]),
+        np.stack([mid - d_m, houston_wts, houston_wti - REFINERY_DISCOUNT_WTS]),
+    ])
+    return buy, sale
+
+
+class _RouteLabels:
+    # Label and route-registry bookkeeping shared by the dense and sparse route economics.
+    # Subclasses provide ``registry()``, the ``ROUTE_DTYPE`` array sorted p -> L -> S -> m -> n.
+
+    def __init__(self, products, buy_locations, sell_options, months):
+        self.products = tuple(products)
+        self.buy_locations = tuple(buy_locations)
+        self.sell_options = tuple(sell_options)
+        self.months = tuple(months)
+        self.product_index = {p: i for i, p in enumerate(self.products)}
+        self.location_index = {L: i for i, L in enumerate(self.buy_locations)}
+        self.option_index = {S: i for i, S in enumerate(self.sell_options)}
+        self.month_index = {m: i for i, m in enumerate(self.months)}
+        # Buy location code of each sell option, or -1 where the option is not a buy location.
+        self.option_location = np.array([self.location_index.get(S, -1) for S in self.sell_options],
+                                        dtype=np.int32)
+        self._codes = None
+
+    def _key(self, p, m, n, L, S):
+        return (self.product_index[p], self.location_index[L], self.option_index[S],
+                self.month_index[m], self.month_index[n])
+
+    def route_index(self):
+        """Return (product, location, option, buy month, sell month) code arrays, one entry per route id."""
+        routes = self.registry()
+        return tuple(routes[field] for field in ROUTE_DTYPE.names)
+
+    @property
+    def n_routes(self):
+        return len(self.registry())
+
+    def route_key(self, r):
+        """Return the (p, L, S, m, n) labels of route ``r``."""
+        p, L, S, m, n = self.registry()[r].tolist()
+        return (self.products[p], self.buy_locations[L], self.sell_options[S],
+                self.months[m], self.months[n])
+
+    def _code(self, p, l, s, m, n):
+        T = len(self.months)
+        p, l, s, m, n = (np.asarray(a, dtype=np.int64) for a in (p, l, s, m, n))
+        return (((p * len(self.buy_locations) + l) * len(self.sell_options) + s) * T + m) * T + n
+
+    def route_id(self, p, m, n, L, S):
+        """Return the route id for the given labels, or raise ``KeyError`` if it is not eligible."""
+        if self._codes is None:
+            # Routes are sorted p -> L -> S -> m -> n, so their mixed-radix codes are ascending.
+            self._codes = self._code(*self.route_index())
+        code = self._code(*self._key(p, m, n, L, S))
+        r = int(np.searchsorted(self._codes, code))
+        if r == len(self._codes) or self._codes[r] != code:
+            raise KeyError((p, L, S, m, n))
+        return r
+
+
+class RouteEconomics(_RouteLabels):
+    """Per-barrel long and short profit for every route.
+
+    ``long`` and ``short`` are indexed [product, buy location, sell option,
+    buy month, sell month]; entries where the sell month precedes the buy
+    month are NaN and ``valid`` is False.
+    """
+
+    def __init__(self, products, buy_locations, sell_options, months, long, short, valid):
+        super().__init__(products, buy_locations, sell_options, months)
+        self.long = long
+        self.short = short
+        self.valid = valid
+        self._registry = None
+
+    def registry(self):
+        """Return the ``ROUTE_DTYPE`` record of every valid route.
+
+        Routes are ordered like the nested p -> L -> S -> m -> n loops in the scripts.
+        """
+        if self._registry is None:
+            self._registry = route_registry(*np.nonzero(self.valid))
+        return self._registry
+
+    def route_long(self):
+        """Return long profit per route, aligned with ``route_index()``."""
+        return self.long[self.route_index()]
+
+    def route_short(self):
+        """Return short profit per route, aligned with ``route_index()``."""
+        return self.short[self.route_index()]
+
+    # Same argument order as the original scalar profit functions.
+    def profit_long(self, p, m, n, L, S):
+        return float(self.long[self._key(p, m, n, L, S)])
+
+    def profit_short(self, p, m, n, L, S):
+        return float(self.short[self._key(p, m, n, L, S)])
+
+
+class SparseRouteEconomics(_RouteLabels):
+    """Long and short profit for an explicit list of eligible routes.
+
+    ``route_index`` holds (product, location, option, buy month, sell month)
+    index arrays sorted in p -> L -> S -> m -> n order; they are packed into
+    the route registry, and ``long`` and ``short`` are aligned with it. No
+    dense tensor is materialized.
+    """
+
+    def __init__(self, products, buy_locations, sell_options, months, route_index, long, short):
+        super().__init__(products, buy_locations, sell_options, months)
+        self._registry = route_registry(*route_index)
+        self.long = long
+        self.short = short
+
+    def registry(self):
+        return self._registry
+
+    def route_long(self):
+        return self.long
+
+    def route_short(self):
+        return self.short
+
+    def profit_long(self, p, m, n, L, S):
+        return float(self.long[self.route_id(p, m, n, L, S)])
+
+    def profit_short(self, p, m, n, L, S):
+        return float(self.short[self.route_id(p, m, n, L, S)])
+
+
+def route_economics(months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                    pipeline_fixed, storage_cost):
+    """Build the long/short profit tensor for the WTI/WTS, M/H -> M/H/R network."""
+    buy, sale = physical_curves(months, midland_price, houston_price, Delta_M, Delta_H,
+                                forecast_adjustment)
+
+    # Pipeline cost applies whenever the sell option differs from the buy location.
+    piped = np.array(BUY_LOCATIONS)[:, None] != np.array(SELL_OPTIONS)[None, :]
+    transport = np.where(piped[None, :, :, None],
+                         pipeline_fixed + PIPELINE_RATE * buy[:, :, None, :], 0.0)
+    outlay = buy[:, :, None, :] + transport                     # [p, L, S, m]
+
+    idx = np.arange(len(months))
+    hold = idx[None, :] - idx[:, None]                          # [m, n]
+    valid = hold >= 0
+
+    margin = sale[:, None, :, None, :] - outlay[..., None]      # [p, L, S, m, n]
+    long = np.where(hold > 0, margin - storage_cost * hold + CARRY_CREDIT, margin)
+    short = outlay[..., None] - sale[:, None, :, None, :]
+
+    valid = np.broadcast_to(valid, long.shape)
+    long = np.where(valid, long, np.nan)
+    short = np.where(valid, short, np.nan)
+    return RouteEconomics(PRODUCTS, BUY_LOCATIONS, SELL_OPTIONS, months, long, short, valid)
+
+
+def check_labels(name, value, known, kind="month"):
+    """Raise unless ``value`` is a dict keyed only by labels in ``known``.
+
+    Partial overrides are merged into full curves, so a misspelt month
+    would otherwise be stored and never read.
+    """
+    if not isinstance(value, dict):
+        raise TypeError(f"{name} takes a {{{kind}: value}} dict, not {type(value).__name__}")
+    unknown = [key for key in value if key not in known]
+    if unknown:
+        raise ValueError(f"{name} has unknown {kind}s {', '.join(map(repr, unknown))}; "
+                         f"expected {', '.join(map(str, known))}")
+
+
+def apply_price_changes(curves, costs, changes):
+    """Merge curve deltas and cost overrides from ``changes`` into ``curves`` and ``costs`` in place.
+
+    Curve deltas may only name months the curves already hold.
+    """
+    for field, value in changes.items():
+        if field in CURVE_FIELDS:
+            check_labels(field, value, list(curves[field]))
+            curves[field].update(value)
+        elif field in COST_FIELDS:
+            costs[field] = value
+        else:
+            raise ValueError(f"Unknown price input {field!r}")
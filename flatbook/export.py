@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+# Column name -> kind ("str", "int" or "float") for each exported table, in file order.
+TRADE_SCHEMA = {
+    "route": "int", "direction": "str", "product": "str", "buy_location": "str", "sell_option": "str",
+    "buy_month": "str", "sell_month": "str", "volume": "float", "profit_per_barrel": "float",
+    "objective": "float",
+}
+LEDGER_SCHEMA = {
+    "product": "str", "month": "str", "open_long": "float", "open_short": "float",
+    "storage_cost": "float", "realized": "float", "running_pnl": "float",
+}
+EXPORT_FORMATS = ("csv", "parquet")
+_FILES = {"trades": TRADE_SCHEMA, "ledger": LEDGER_SCHEMA}
+_KINDS = {"str": str, "int": np.int64, "float": np.float64}
+
+
+class Table:
+    """Named, equal-length NumPy columns in schema order.
+
+    Columns are plain arrays, so ``to_frame`` and ``to_arrow`` hand the
+    numeric ones over without copying.
+    """
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def rows(self):
+        """Yield one dict per row."""
+        names = list(self.columns)
+        for values in zip(*(self.columns[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+    def to_frame(self):
+        """Return the table as a pandas DataFrame (requires pandas)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
+
+    def to_arrow(self):
+        """Return the table as a pyarrow Table (requires pyarrow)."""
+        import pyarrow as pa
+
+        return pa.table(self.columns)
+
+
+def trade_table(econ, long, short, threshold=1e-3):
+    """One row per traded direction of each route, in route id order with LONG before SHORT.
+
+    ``profit_per_barrel`` is the route profit as printed (``route_long`` or
+    ``route_short``); ``objective`` is the row's signed contribution to the
+    objective, so the column sums to the total profit.
+    """
+    long_ids = np.nonzero(long > threshold)[0]
+    short_ids = np.nonzero(short > threshold)[0]
+    ids = np.concatenate([long_ids, short_ids])
+    is_short = np.repeat([False, True], [len(long_ids), len(short_ids)])
+    order = np.lexsort((is_short, ids))
+    ids, is_short = ids[order], is_short[order]
+
+    route_p, route_l, route_s, route_m, route_n = (a[ids] for a in econ.route_index())
+    months = np.asarray(econ.months)
+    volume = np.where(is_short, short[ids], long[ids])
+    per_barrel = np.where(is_short, econ.route_short()[ids], econ.route_long()[ids])
+    return Table({
+        "route": ids.astype(np.int64),
+        "direction": np.where(is_short, "SHORT", "LONG"),
+        "product": np.asarray(econ.products)[route_p],
+        "buy_location": np.asarray(econ.buy_locations)[route_l],
+        "sell_option": np.asarray(econ.sell_options)[route_s],
+        "buy_month": months[route_m],
+        "sell_month": months[route_n],
+        "volume": volume,
+        "profit_per_barrel": per_barrel,
+        "objective": np.where(is_short, -volume * per_barrel, volume * per_barrel),
+    })
+
+
+def ledger_table(ledger):
+    """One row per (product, month) of a ``PositionLedger``, product-major."""
+    P, T = len(ledger.products), len(ledger.months)
+    return Table({
+        "product": np.repeat(np.asarray(ledger.products), T),
+        "month": np.tile(np.asarray(ledger.months), P),
+        "open_long": ledger.open_long.ravel(),
+        "open_short": ledger.open_short.ravel(),
+        "storage_cost": ledger.storage_cost.ravel(),
+        "realized": ledger.realized.ravel(),
+        "running_pnl": ledger.running_pnl.ravel(),
+    })
+
+
+def _table_path(directory, name, fmt):
+    return os.path.join(directory, f"{name}.{fmt}")
+
+
+def write_table(table, path, fmt="csv"):
+    """Write ``table`` in one pass; CSV floats use ``repr`` so they read back bit for bit."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table.to_arrow(), path)
+        return
+    names = list(table.columns)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(zip(*(table.columns[name].tolist() for name in names)))
+
+
+def read_table(path, schema, fmt="csv"):
+    """Read a table written by ``write_table``, typing its columns by ``schema``."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        arrow = pq.read_table(path)
+        return Table({name: np.asarray(arrow.column(name).to_numpy(zero_copy_only=False),
+                                       dtype=_KINDS[kind])
+                      for name, kind in schema.items()})
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        values = list(zip(*reader)) or [()] * len(header)
+    raw = dict(zip(header, values))
+    return Table({name: np.array(raw[name], dtype=_KINDS[kind]) for name, kind in schema.items()})
+
+
+def write_results(directory, trades, ledger, metadata, fmt="csv"):
+    """Write ``trades.<fmt>``, ``ledger.<fmt>`` and ``run.json`` into ``directory``."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+    os.makedirs(directory, exist_ok=True)
+    write_table(trades, _table_path(directory, "trades", fmt), fmt)
+    write_table(ledger, _table_path(directory, "ledger", fmt), fmt)
+    with open(os.path.join(directory, "run.json"), "w") as f:
+        json.dump(dict(metadata, format=fmt), f, indent=2, default=str)
+
+
+def read_results(directory):
+    """Return ``(trades, ledger, metadata)`` written by ``write_results``."""
+    with open(os.path.join(directory, "run.json")) as f:
+        metadata = json.load(f)
+    fmt = metadata.get("format", "csv")
+    tables = [read_table(_table_path(directory, name, fmt), schema, fmt) for name, schema in _FILES.items()]
+    return tables[0], tables[1], metadata
+
+
+def load_runs(directories):
+    """Stack many ``write_results`` directories into one trades and one ledger table.
+
+    Each table gains a leading ``run`` column holding the directory's
+    position in ``directories``; the metadata come back as a list in the
+    same order. Every column is concatenated once, so thousands of runs
+    join in a single pass.
+    """
+    results = [read_results(directory) for directory in directories]
+    stacked = []
+    for i, schema in enumerate(_FILES.values()):
+        tables = [result[i] for result in results]
+        run = np.repeat(np.arange(len(tables), dtype=np.int64), [len(t) for t in tables])
+        columns = {name: np.concatenate([t[name] for t in tables]) if tables else np.zeros(0, dtype=_KINDS[kind])
+                   for name, kind in schema.items()}
+        stacked.append(Table({"run": run, **columns}))
+    return stacked[0], stacked[1], [result[2] for result in results]
+
+
+def format_trades(trades):
+    """Yield the console line for each row of a trade table."""
+    for row in trades.rows():
+        # For output, label sell option "R" as "Refinery (H)"
+        sell_label = row["sell_option"] if row["sell_option"] != "R" else "Refinery (H)"
+        p, m, n, L = row["product"], row["buy_month"], row["sell_month"], row["buy_location"]
+        if row["direction"] == "LONG":
+            yield (f"  LONG: Buy {p} in {m} at {L} and Sell in {n} via {sell_label}: {row['volume']:,.0f} barrels; "
+                   f"Profit/barrel: ${row['profit_per_barrel']:.4f}")
+        else:
+            yield (f"  SHORT: Sell {p} in {m} at {L} and Cover in {n} via {sell_label}: {row['volume']:,.0f} barrels; "
+                   f"Profit/barrel: ${row['profit_per_barrel']:.4f}")
+
+
+def format_ledger(ledger):
+    """Yield the console lines of the monthly position summary from a ledger table."""
+    product = None
+    for row in ledger.rows():
+        if row["product"] != product:
+            product = row["product"]
+            yield f"\nProduct: {product}"
+        yield f"  End of {row['month']}:"
+        yield f"    Open Long Position = {row['open_long']:,.0f} barrels; Storage Cost = ${row['storage_cost']:,.2f}"
+        yield f"    Open Short Position = {row['open_short']:,.0f} barrels"
+        yield f"    Realized Profit This Month = ${row['realized']:,.2f}"
+        yield f"    Running Cumulative P&L = ${row['running_pnl']:,.2f}"
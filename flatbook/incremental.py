@@ -0,0 +1,147 @@
+import time
+
+import numpy as np
+
+from flatbook.economics import apply_price_changes, check_labels, route_economics
+from flatbook.model import INVENTORY_CAP, capacity_array, inventory_cap_array
+from flatbook.sparse import _highspy, build_sparse_lp, highs_solver
+
+
+class IncrementalModel:
+    """A persistent HiGHS model that re-optimizes from its last basis when prices tick.
+
+    The constraint matrix is built once. ``update`` recomputes the route
+    economics, pushes only the objective coefficients that moved and
+    re-runs simplex from the previous optimal basis. ``update_capacity``
+    does the same for the ``BuyCap``/``SellCap``/``InvCap`` right-hand sides.
+    """
+
+    def __init__(self, months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                 pipeline_fixed, storage_cost, cap, inventory_cap=INVENTORY_CAP, threshold=1e-3):
+        self.months = list(months)
+        self.curves = {
+            "midland_price": dict(midland_price),
+            "houston_price": dict(houston_price),
+            "Delta_M": dict(Delta_M),
+            "Delta_H": dict(Delta_H),
+            "forecast_adjustment": dict(forecast_adjustment),
+        }
+        self.costs = {"pipeline_fixed": pipeline_fixed, "storage_cost": storage_cost}
+        self.cap = {p: dict(c) for p, c in cap.items()}
+        self.inventory_cap = inventory_cap
+        self.threshold = threshold
+
+        self.econ = self._economics()
+        self.lp = build_sparse_lp(self.econ, self.cap, inventory_cap)
+        self.c = self.lp.c.copy()
+        self.b_ub = self.lp.b_ub.copy()
+
+        self.highs = highs_solver(self.lp)
+
+        self.objective = None
+        self.status = None
+        self.iterations = 0
+        self.solve_seconds = 0.0
+        self.long = np.zeros(self.lp.n_routes)
+        self.short = np.zeros(self.lp.n_routes)
+        self._run()
+
+    def _economics(self, curves=None, costs=None):
+        c = curves or self.curves
+        costs = costs or self.costs
+        return route_economics(self.months, c["midland_price"], c["houston_price"], c["Delta_M"],
+                               c["Delta_H"], c["forecast_adjustment"], costs["pipeline_fixed"],
+                               costs["storage_cost"])
+
+    def _run(self):
+        start = time.perf_counter()
+        self.highs.run()
+        self.solve_seconds = time.perf_counter() - start
+        info = self.highs.getInfo()
+        self.status = self.highs.modelStatusToString(self.highs.getModelStatus())
+        self.iterations = info.simplex_iteration_count
+        previous = self.long, self.short
+        if self.status == "Optimal":
+            self.objective = -info.objective_function_value
+            x = np.asarray(self.highs.getSolution().col_value)
+            R = self.lp.n_routes
+            self.long, self.short = x[:R], x[R:]
+        else:
+            self.objective = None
+        return self._changed_trades(*previous)
+
+    def _changed_trades(self, old_long, old_short):
+        moved = np.nonzero((np.abs(self.long - old_long) > self.threshold) |
+                           (np.abs(self.short - old_short) > self.threshold))[0]
+        return {self.econ.route_key(r): (float(old_long[r]), float(old_short[r]),
+                                         float(self.long[r]), float(self.short[r])) for r in moved}
+
+    def update(self, **changes):
+        """Apply a price-curve delta and re-solve from the previous basis.
+
+        Curve arguments (``midland_price``, ``houston_price``, ``Delta_M``,
+        ``Delta_H``, ``forecast_adjustment``) take partial ``{month: value}``
+        dicts; ``pipeline_fixed`` and ``storage_cost`` take scalars. Returns
+        ``{route_key: (old_long, old_short, new_long, new_short)}`` for every
+        route whose volume moved. The changes are priced on copies first, so
+        invalid input raises without touching the committed model.
+        """
+        curves = {field: dict(values) for field, values in self.curves.items()}
+        costs = dict(self.costs)
+        apply_price_changes(curves, costs, changes)
+        econ = self._economics(curves, costs)
+        self.curves, self.costs, self.econ = curves, costs, econ
+        c = np.concatenate([-econ.route_long(), econ.route_short()])
+        moved = np.nonzero(c != self.c)[0]
+        if len(moved):
+            self.highs.changeColsCost(len(moved), moved.astype(np.int32), c[moved])
+            self.c = c
+        return self._run()
+
+    def evaluate(self, **changes):
+        """Solve a what-if with ``changes`` applied, leaving the committed prices in place.
+
+        Takes the same arguments as ``update`` and returns ``(status,
+        objective, long, short)``. The committed costs and basis are put
+        back afterwards, so the next ``update`` starts from the same state.
+        """
+        curves = {field: dict(values) for field, values in self.curves.items()}
+        costs = dict(self.costs)
+        apply_price_changes(curves, costs, changes)
+        econ = self._economics(curves, costs)
+        c = np.concatenate([-econ.route_long(), econ.route_short()])
+        moved = np.nonzero(c != self.c)[0].astype(np.int32)
+        basis = self.highs.getBasis()
+        self.highs.changeColsCost(len(moved), moved, c[moved])
+        try:
+            self.highs.run()
+            status = self.highs.modelStatusToString(self.highs.getModelStatus())
+            if status != "Optimal":
+                return status, None, None, None
+            x = np.asarray(self.highs.getSolution().col_value)
+            R = self.lp.n_routes
+            return status, -self.highs.getInfo().objective_function_value, x[:R], x[R:]
+        finally:
+            self.highs.changeColsCost(len(moved), moved, self.c[moved])
+            self.highs.setBasis(basis)
+
+    def update_capacity(self, cap=None, inventory_cap=None):
+        """Change ``BuyCap``/``SellCap`` (``cap[p][m]``) or ``InvCap`` limits and re-solve."""
+        new_cap = {p: dict(months) for p, months in self.cap.items()}
+        if cap is not None:
+            check_labels("cap", cap, list(new_cap), "product")
+            for p, months in cap.items():
+                check_labels(f"cap[{p!r}]", months, self.months)
+                new_cap[p].update(months)
+        new_inventory_cap = self.inventory_cap if inventory_cap is None else inventory_cap
+        cap_arr = capacity_array(self.econ, new_cap).ravel()
+        inv_cap = np.repeat(inventory_cap_array(self.econ, new_inventory_cap), len(self.months))
+        b_ub = np.concatenate([cap_arr, cap_arr, inv_cap])
+        self.cap, self.inventory_cap = new_cap, new_inventory_cap
+        moved = np.nonzero(b_ub != self.b_ub)[0]
+        if len(moved):
+            highspy = _highspy()
+            self.highs.changeRowsBounds(len(moved), moved.astype(np.int32),
+                                        np.full(len(moved), -highspy.kHighsInf), b_ub[moved])
+            self.b_ub = b_ub
+        return self._run()
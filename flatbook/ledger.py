@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class PositionLedger:
+    """Monthly position and P&L per product, as [product, month] arrays.
+
+    ``open_long`` and ``open_short`` are the volumes open at the end of
+    each month (bought or sold in month m and not yet settled in month n),
+    ``storage_cost`` is the carry charged on the open long volume,
+    ``realized`` is the route profit booked in each route's sell month and
+    ``running_pnl`` accumulates ``realized - storage_cost``.
+    """
+
+    def __init__(self, products, months, open_long, open_short, storage_cost, realized):
+        self.products = tuple(products)
+        self.months = tuple(months)
+        self.open_long = open_long
+        self.open_short = open_short
+        self.storage_cost = storage_cost
+        self.realized = realized
+        self.running_pnl = np.cumsum(realized - storage_cost, axis=1)
+
+    def rows(self):
+        """Yield one dict per (product, month) in product-major order."""
+        for pi, p in enumerate(self.products):
+            for t, m in enumerate(self.months):
+                yield {"product": p, "month": m, "open_long": float(self.open_long[pi, t]),
+                       "open_short": float(self.open_short[pi, t]),
+                       "storage_cost": float(self.storage_cost[pi, t]),
+                       "realized": float(self.realized[pi, t]),
+                       "running_pnl": float(self.running_pnl[pi, t])}
+
+    def to_frame(self):
+        """Return the ledger as a pandas DataFrame (requires pandas)."""
+        import pandas as pd
+
+        return pd.DataFrame(list(self.rows()))
+
+
+def _month_sum(index, weights, size):
+    return np.bincount(index, weights=weights, minlength=size)
+
+
+def position_ledger(econ, long, short, storage_cost):
+    """Build the monthly position and P&L ledger in one pass over the routes.
+
+    Each route adds its volume to a difference array at its buy month and
+    removes it at its sell month, so a prefix sum over months gives the
+    open positions. Cost is O(months + routes) instead of months x routes.
+    """
+    route_p, _, _, route_m, route_n = econ.route_index()
+    P, T = len(econ.products), len(econ.months)
+    size = P * (T + 1)
+    enter = route_p * (T + 1) + route_m
+    leave = route_p * (T + 1) + route_n
+
+    def open_volume(vol):
+        diff = (_month_sum(enter, vol, size) - _month_sum(leave, vol, size)).reshape(P, T + 1)
+        return np.cumsum(diff, axis=1)[:, :T]
+
+    open_long = open_volume(long)
+    open_short = open_volume(short)
+    pnl = econ.route_long() * long + econ.route_short() * short
+    realized = _month_sum(route_p * T + route_n, pnl, P * T).reshape(P, T)
+    return PositionLedger(econ.products, econ.months, open_long, open_short, storage_cost * open_long,
+                          realized)
@@ -0,0 +1,214 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Default storage limit per location and month, in barrels.
+INVENTORY_CAP = 3000000
+
+SOLVE_MODES = ("lp", "mip")
+
+
+def capacity_array(econ, cap):
+    """Return monthly capacity as a [product, month] array from ``cap[p][m]`` or an array."""
+    if isinstance(cap, dict):
+        return np.array([[cap[p][m] for m in econ.months] for p in econ.products], dtype=float)
+    return np.asarray(cap, dtype=float)
+
+
+def inventory_cap_array(econ, inventory_cap):
+    """Return the storage limit per buy location from a scalar or per-location values."""
+    return np.broadcast_to(np.asarray(inventory_cap, dtype=float), (len(econ.buy_locations),))
+
+
+def stored_routes(econ):
+    """Return the routes counted by ``InvCap``: long volume bought at L, sold via L, held past its buy month."""
+    p, l, s, m, n = econ.route_index()
+    return np.nonzero((econ.option_location[s] == l) & (n > m))[0]
+
+
+class FlatBookModel:
+    """A built PuLP problem together with its route variables.
+
+    ``xplus``/``xminus`` (and in MIP mode ``yplus``/``yminus``) are lists of
+    PuLP variables indexed by route id, aligned with ``econ.route_index()``;
+    directions removed by a route screen hold ``None``.
+    """
+
+    def __init__(self, econ, prob, mode, xplus, xminus, yplus=None, yminus=None):
+        self.econ = econ
+        self.prob = prob
+        self.mode = mode
+        self.xplus = xplus
+        self.xminus = xminus
+        self.yplus = yplus
+        self.yminus = yminus
+
+    def route_volumes(self):
+        """Return solved (long, short) volume arrays aligned with ``econ.route_index()``."""
+        long = np.array([(v.varValue or 0.0) if v is not None else 0.0 for v in self.xplus], dtype=float)
+        short = np.array([(v.varValue or 0.0) if v is not None else 0.0 for v in self.xminus], dtype=float)
+        return long, short
+
+
+class _PhaseClock:
+    # Accumulates wall time per build phase into ``timings`` when one is given.
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[phase] = self.timings.get(phase, 0.0) + now - self.last
+            self.last = now
+
+
+def _route_names(econ):
+    # "p_L_S_m_n" per route id, joined from label arrays instead of per-route key lookups.
+    p, l, s, m, n = econ.route_index()
+    labels = (np.array(econ.products)[p], np.array(econ.buy_locations)[l], np.array(econ.sell_options)[s],
+              np.array(econ.months)[m], np.array(econ.months)[n])
+    return ["_".join(key) for key in zip(*(a.tolist() for a in labels))]
+
+
+def _groups(keys, size):
+    # Route ids grouped by integer key, as a list of ``size`` arrays.
+    order = np.argsort(keys, kind="stable")
+    return np.split(order, np.cumsum(np.bincount(keys, minlength=size))[:-1])
+
+
+def build_pulp_model(econ, cap, mode="lp", inventory_cap=INVENTORY_CAP, timings=None, screen=None):
+    """Build the flat-book model.
+
+    ``mode="lp"`` creates only the continuous ``xplus``/``xminus`` volumes.
+    ``mode="mip"`` also adds a ``yplus``/``yminus`` binary per route with
+    ``LinkPlus``/``LinkMinus`` big-M constraints; keep it for when fixed-cost
+    or minimum-lot constraints need the binaries. With a ``RouteScreen``
+    only the directions it keeps get variables. If ``timings`` is a dict,
+    seconds spent per build phase are added to it.
+    """
+    if mode not in SOLVE_MODES:
+        raise ValueError(f"Unknown solve mode {mode!r}; expected one of {SOLVE_MODES}")
+    import pulp
+
+    mip = mode == "mip"
+
+    products = econ.products
+    months = econ.months
+    cap_arr = capacity_array(econ, cap)
+    inv_cap = inventory_cap_array(econ, inventory_cap)
+    route_p, route_l, route_s, route_m, route_n = econ.route_index()
+    profit_long = econ.route_long()
+    profit_short = econ.route_short()
+    names = _route_names(econ)
+    keep_long = screen.keep_long if screen is not None else np.ones(len(names), dtype=bool)
+    keep_short = screen.keep_short if screen is not None else np.ones(len(names), dtype=bool)
+    clock = _PhaseClock(timings)
+
+    # Initialize the decision variables, one long and one short volume per route id.
+    plus_vars = [pulp.LpVariable(f"xplus_{name}", lowBound=0, cat="Continuous") if keep else None
+                 for name, keep in zip(names, keep_long.tolist())]
+    minus_vars = [pulp.LpVariable(f"xminus_{name}", lowBound=0, cat="Continuous") if keep else None
+                  for name, keep in zip(names, keep_short.tolist())]
+    clock.mark("variables")
+
+    yplus = yminus = None
+    if mip:
+        prob = pulp.LpProblem("Enhanced_FlatBook_MIP_Optimization", pulp.LpMaximize)
+        # Big-M constant and linking constraints: if the binary variable is 0, then volume must be 0.
+        BIG_M = cap_arr.max() * 10
+        yplus = [pulp.LpVariable(f"yplus_{name}", cat="Binary") if xp is not None else None
+                 for name, xp in zip(names, plus_vars)]
+        yminus = [pulp.LpVariable(f"yminus_{name}", cat="Binary") if xm is not None else None
+                  for name, xm in zip(names, minus_vars)]
+        for name, xp, xm, yp, ym in zip(names, plus_vars, minus_vars, yplus, yminus):
+            if xp is not None:
+                prob += xp <= BIG_M * yp, f"LinkPlus_{name}"
+            if xm is not None:
+                prob += xm <= BIG_M * ym, f"LinkMinus_{name}"
+        clock.mark("LinkPlus/LinkMinus")
+    else:
+        prob = pulp.LpProblem("Enhanced_FlatBook_LP_Optimization", pulp.LpMaximize)
+
+    # Objective: maximize total profit.
+    # For long trades: use profit_long; for short trades: use profit_short.
+    long_ids = np.nonzero(keep_long)[0]
+    short_ids = np.nonzero(keep_short)[0]
+    prob += (pulp.lpSum(float(profit_long[r]) * plus_vars[r] for r in long_ids)
+             - pulp.lpSum(float(profit_short[r]) * minus_vars[r] for r in short_ids))
+    clock.mark("objective")
+
+    # Buying and selling capacity constraints: for each product and each buy (sell) month.
+    T = len(months)
+    by_buy = _groups(route_p * T + route_m, len(products) * T)
+    by_sell = _groups(route_p * T + route_n, len(products) * T)
+    for label, groups in (("BuyCap", by_buy), ("SellCap", by_sell)):
+        for pi, p in enumerate(products):
+            for t, m in enumerate(months):
+                group = groups[pi * T + t]
+                terms = ([plus_vars[r] for r in group[keep_long[group]]]
+                         + [minus_vars[r] for r in group[keep_short[group]]])
+                prob += pulp.lpSum(terms) <= cap_arr[pi, t], f"{label}_{p}_{m}"
+        clock.mark(label)
+
+    # Flat-book constraint: for each product, total long equals total short.
+    for pi, p in enumerate(products):
+        prob += (pulp.lpSum(plus_vars[r] for r in long_ids[route_p[long_ids] == pi])
+                 == pulp.lpSum(minus_vars[r] for r in short_ids[route_p[short_ids] == pi]), f"FlatBook_{p}")
+    clock.mark("FlatBook")
+
+    # Storage constraint: for each location and each month t, active inventory from routes where
+    # buy and sell are the same must be <= the location's inventory cap.
+    stored = stored_routes(econ)
+    stored = stored[keep_long[stored]]
+    for li, L in enumerate(econ.buy_locations):
+        at_L = stored[route_l[stored] == li]
+        for t, month in enumerate(months):
+            open_at_t = at_L[(route_m[at_L] <= t) & (t < route_n[at_L])]
+            terms = [plus_vars[r] for r in open_at_t]
+            prob += pulp.lpSum(terms) <= inv_cap[li], f"InvCap_{L}_{month}"
+    clock.mark("InvCap")
+
+    return FlatBookModel(econ, prob, mode, plus_vars, minus_vars, yplus, yminus)
+
+
+def solve_with_cbc(prob, msg=1, capture_log=False, time_limit=None, mip_gap=None, threads=None):
+    """Solve ``prob`` with CBC and return its solver statistics.
+
+    With ``capture_log`` the CBC log goes to a temporary file instead of
+    stdout and is parsed into ``iterations``, ``nodes`` and ``mip_gap``;
+    otherwise an empty dict is returned. ``time_limit`` (seconds),
+    ``mip_gap`` (relative) and ``threads`` are passed to CBC.
+    """
+    from flatbook.solvers import solver_command
+
+    limits = {"time_limit": time_limit, "mip_gap": mip_gap, "threads": threads}
+    if not capture_log:
+        prob.solve(solver_command("cbc", msg=msg, **limits))
+        return {}
+    from flatbook.telemetry import cbc_log_stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "cbc.log")
+        prob.solve(solver_command("cbc", msg=0, log_path=log_path, **limits))
+        with open(log_path) as f:
+            return cbc_log_stats(f.read())
+
+
+def compare_modes(econ, cap, inventory_cap=INVENTORY_CAP, tol=1e-6):
+    """Solve the LP and MIP forms and return ``(lp_objective, mip_objective, match)``."""
+    import pulp
+
+    objectives = {}
+    for mode in SOLVE_MODES:
+        model = build_pulp_model(econ, cap, mode=mode, inventory_cap=inventory_cap)
+        model.prob.solve(pulp.PULP_CBC_CMD(msg=0))
+        if model.prob.status != pulp.LpStatusOptimal:
+            raise RuntimeError(f"{mode.upper()} solve ended with status {pulp.LpStatus[model.prob.status]}")
+        objectives[mode] = pulp.value(model.prob.objective)
+    lp_obj, mip_obj = objectives["lp"], objectives["mip"]
+    match = abs(lp_obj - mip_obj) <= tol * max(1.0, abs(mip_obj))
+    return lp_obj, mip_obj, match
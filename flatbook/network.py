@@ -0,0 +1,216 @@
+import numpy as np
+
+from flatbook.model import INVENTORY_CAP, capacity_array, inventory_cap_array, stored_routes
+from flatbook.sparse import SparseSolution, build_sparse_lp, solve_sparse_lp
+
+_EPS = 1e-9
+
+
+def inventory_load(econ, long):
+    """Return open stored long volume [location, month] counted by the ``InvCap`` rows."""
+    p, l, s, m, n = econ.route_index()
+    stored = stored_routes(econ)
+    T = len(econ.months)
+    # Difference array: volume enters storage in month m and leaves in month n.
+    diff = np.zeros((len(econ.buy_locations), T + 1))
+    np.add.at(diff, (l[stored], m[stored]), long[stored])
+    np.add.at(diff, (l[stored], n[stored]), -long[stored])
+    return np.cumsum(diff, axis=1)[:, :T]
+
+
+def _best_routes(econ, pi):
+    """Best long and best short route per (buy month, sell month) pair for product ``pi``.
+
+    Capacity and flat-book rows only see a route's months, so only the most
+    profitable location/option choice per pair can carry volume. Ties prefer
+    routes that do not occupy storage. Returns ``(a, a_route, b, b_route)``
+    as [m, n] arrays of profit and route number, ``-inf``/``-1`` where the
+    pair has no route.
+    """
+    route_p, _, _, route_m, route_n = econ.route_index()
+    T = len(econ.months)
+    routes = np.nonzero(route_p == pi)[0]
+    in_storage = np.zeros(econ.n_routes, dtype=bool)
+    in_storage[stored_routes(econ)] = True
+    pair = route_m[routes] * T + route_n[routes]
+
+    def pick(values):
+        # Sort by pair, then best value, then non-storage first; keep the first route per pair.
+        order = np.lexsort((in_storage[routes], -values[routes], pair))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = pair[order][1:] != pair[order][:-1]
+        chosen = routes[order[first]]
+        best = np.full(T * T, -np.inf)
+        route = np.full(T * T, -1)
+        best[pair[order[first]]] = values[chosen]
+        route[pair[order[first]]] = chosen
+        return best.reshape(T, T), route.reshape(T, T)
+
+    a, a_route = pick(econ.route_long())
+    b, b_route = pick(-econ.route_short())
+    return a, a_route, b, b_route
+
+
+def _shortest_path(cost, arcs, flow, source_open, sink_open):
+    """Cheapest residual s-t path of the bipartite transportation network.
+
+    Forward arcs buy m -> sell n exist where ``arcs`` is set and cost
+    ``cost[m, n]``; backward arcs sell n -> buy m exist where ``flow`` is
+    positive and cost ``-cost[m, n]``. Source arcs reach the buys in
+    ``source_open`` and sink arcs leave the sells in ``sink_open``, all at
+    zero cost. The residual graph has no negative cycle while the flow is
+    optimal for its value, so labels are corrected in whole-matrix passes
+    (one per alternation of the path) until they settle. Returns the path
+    cost and its (buy, sell) pairs from source to sink, or ``(inf, None)``.
+    """
+    T = len(source_open)
+    forward = np.where(arcs, cost, np.inf)
+    backward = np.where(flow > _EPS, -cost, np.inf)
+    dist_buy = np.where(source_open, 0.0, np.inf)
+    from_sell = np.full(T, -1)
+    dist_sell = np.full(T, np.inf)
+    from_buy = np.full(T, -1)
+    cols = np.arange(T)
+    for _ in range(2 * T + 2):
+        # Labels and predecessors move only on strict improvement, so ties cannot close a cycle.
+        reach = dist_buy[:, None] + forward
+        via_buy = reach.argmin(axis=0)
+        better = reach[via_buy, cols] < dist_sell - _EPS
+        dist_sell = np.where(better, reach[via_buy, cols], dist_sell)
+        from_buy = np.where(better, via_buy, from_buy)
+        back = dist_sell[None, :] + backward
+        via_sell = back.argmin(axis=1)
+        improved = back[cols, via_sell] < dist_buy - _EPS
+        if not improved.any() and not better.any():
+            break
+        dist_buy = np.where(improved, back[cols, via_sell], dist_buy)
+        from_sell = np.where(improved, via_sell, from_sell)
+    else:
+        raise RuntimeError("shortest path labels did not settle; the residual graph has a negative cycle")
+
+    last = np.where(sink_open, dist_sell, np.inf)
+    n = int(last.argmin())
+    if not np.isfinite(last[n]):
+        return np.inf, None
+    path = []
+    while True:
+        m = int(from_buy[n])
+        path.append((m, n))
+        if from_sell[m] < 0:
+            break
+        n = int(from_sell[m])
+    path.reverse()
+    return float(last[path[-1][1]]), path
+
+
+def _transportation(weight, cap):
+    """Maximum-weight flow from buy months to sell months by successive shortest paths.
+
+    ``weight[m, n]`` is the profit per barrel on the (m, n) arc (``-inf``
+    where no route exists) and ``cap[t]`` bounds the volume bought and the
+    volume sold in month ``t``. Each augmentation follows the cheapest
+    residual path, found with vectorized passes over the [m, n] arc
+    matrix, and stops once no path earns a positive profit. Returns the
+    flow matrix [m, n].
+    """
+    T = len(cap)
+    arcs = np.isfinite(weight) & (weight > _EPS)
+    cost = np.where(arcs, -weight, 0.0)
+    flow = np.zeros((T, T))
+    bought = np.zeros(T)
+    sold = np.zeros(T)
+    cap = np.asarray(cap, dtype=float)
+    while True:
+        length, path = _shortest_path(cost, arcs, flow, cap - bought > _EPS, cap - sold > _EPS)
+        if path is None or length >= -_EPS:
+            break
+        first, last = path[0][0], path[-1][1]
+        # The path enters at its first buy, alternates forward and backward arcs, and leaves at its last sell.
+        delta = min(cap[first] - bought[first], cap[last] - sold[last])
+        for (m, _), (_, n) in zip(path[1:], path[:-1]):
+            delta = min(delta, flow[m, n])
+        for m, n in path:
+            flow[m, n] += delta
+        for (m, _), (_, n) in zip(path[1:], path[:-1]):
+            flow[m, n] -= delta
+        bought[first] += delta
+        sold[last] += delta
+    return np.where(arcs, flow, 0.0)
+
+
+def _lagrangian_flow(a, b, cap, lam):
+    # With lambda priced on the flat-book row, each (m, n) pair carries only its better direction.
+    long_w = a - lam
+    short_w = b + lam
+    use_long = long_w >= short_w
+    flow = _transportation(np.where(use_long, long_w, short_w), cap)
+    f_long = np.where(use_long, flow, 0.0)
+    f_short = np.where(use_long, 0.0, flow)
+    gain = float(np.sum(np.where(f_long > 0, a, 0.0) * f_long) + np.sum(np.where(f_short > 0, b, 0.0) * f_short))
+    return f_long, f_short, gain, float(f_long.sum() - f_short.sum())
+
+
+def _solve_product(a, b, cap, tol):
+    """Maximize long/short profit for one product under capacity and flat-book rows.
+
+    Minimizes the convex Lagrangian dual over the flat-book multiplier with
+    1-D cutting planes, then mixes the two flows that bracket the optimal
+    multiplier so total long equals total short.
+    """
+    finite = np.concatenate([a[np.isfinite(a)], b[np.isfinite(b)]])
+    bound = 2.0 * (np.abs(finite).max(initial=0.0) + 1.0)
+    lo = _lagrangian_flow(a, b, cap, -bound)   # longs only
+    hi = _lagrangian_flow(a, b, cap, bound)    # shorts only
+    if lo[3] <= tol:
+        return lo[0], lo[1], lo[2]
+    if hi[3] >= -tol:
+        return hi[0], hi[1], hi[2]
+
+    while True:
+        # Intersection of the dual lines gain - lambda * imbalance on either side.
+        lam = (lo[2] - hi[2]) / (lo[3] - hi[3])
+        mid = _lagrangian_flow(a, b, cap, lam)
+        expected = lo[2] - lam * lo[3]
+        if abs(mid[3]) <= tol:
+            return mid[0], mid[1], mid[2]
+        if mid[2] - lam * mid[3] <= expected + tol * max(1.0, abs(expected)):
+            break
+        if mid[3] > 0:
+            lo = mid
+        else:
+            hi = mid
+
+    theta = -hi[3] / (lo[3] - hi[3])
+    f_long = theta * lo[0] + (1 - theta) * hi[0]
+    f_short = theta * lo[1] + (1 - theta) * hi[1]
+    return f_long, f_short, theta * lo[2] + (1 - theta) * hi[2]
+
+
+def solve_network(econ, cap, inventory_cap=INVENTORY_CAP, fallback=True, tol=1e-6):
+    """Solve the flat-book model as one transportation problem per product.
+
+    The ``InvCap`` rows are not part of the network. If the flow solution
+    violates them the full sparse LP is solved instead (``fallback=True``);
+    otherwise the status reports the violation. The returned solution's
+    ``message`` names the engine that produced it.
+    """
+    cap_arr = capacity_array(econ, cap)
+    long = np.zeros(econ.n_routes)
+    short = np.zeros(econ.n_routes)
+    objective = 0.0
+    for pi in range(len(econ.products)):
+        a, a_route, b, b_route = _best_routes(econ, pi)
+        f_long, f_short, gain = _solve_product(a, b, cap_arr[pi], tol)
+        objective += gain
+        for flow, route, out in ((f_long, a_route, long), (f_short, b_route, short)):
+            mi, ni = np.nonzero(flow > 0)
+            out[route[mi, ni]] = flow[mi, ni]
+
+    load = inventory_load(econ, long)
+    if np.all(load <= inventory_cap_array(econ, inventory_cap)[:, None] * (1 + tol)):
+        return SparseSolution(econ, "Optimal", "network", objective, long, short)
+    if not fallback:
+        return SparseSolution(econ, "Infeasible", "network: InvCap violated", objective, long, short)
+    solution = solve_sparse_lp(build_sparse_lp(econ, cap, inventory_cap))
+    solution.message = f"lp fallback: {solution.message}"
+    return solution
@@ -0,0 +1,164 @@
+import time
+
+import numpy as np
+
+from flatbook.economics import route_economics
+
+# Curves simulated by ``simulate_pnl``, in factor order.
+RISK_FACTORS = ("midland_price", "houston_price", "Delta_M", "Delta_H")
+# Default monthly volatility of each factor in $/bbl, and their correlation.
+FACTOR_VOL = (2.00, 2.00, 0.15, 0.15)
+FACTOR_CORRELATION = (
+    (1.00, 0.95, 0.20, 0.15),
+    (0.95, 1.00, 0.15, 0.20),
+    (0.20, 0.15, 1.00, 0.60),
+    (0.15, 0.20, 0.60, 1.00),
+)
+# Working memory for one chunk of simulated paths.
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class RiskReport:
+    """P&L distribution of a fixed book over simulated price paths.
+
+    ``pnl`` has one entry per path. ``routes`` lists the route ids that
+    carry volume; ``route_mean``, ``route_std`` and ``contribution`` are
+    aligned with it. ``var`` and ``cvar`` are losses below the expected
+    P&L at ``confidence``, and ``contribution`` splits ``cvar`` by route
+    (each route's mean P&L less its mean over the tail paths), so the
+    contributions sum to ``cvar``.
+    """
+
+    def __init__(self, econ, confidence, pnl, routes, route_mean, route_std, contribution, elapsed):
+        self.econ = econ
+        self.confidence = confidence
+        self.pnl = pnl
+        self.routes = routes
+        self.route_mean = route_mean
+        self.route_std = route_std
+        self.contribution = contribution
+        self.elapsed = elapsed
+
+    @property
+    def n_paths(self):
+        return len(self.pnl)
+
+    @property
+    def expected(self):
+        return float(self.pnl.mean())
+
+    @property
+    def var(self):
+        return self.expected - float(np.quantile(self.pnl, 1.0 - self.confidence))
+
+    @property
+    def cvar(self):
+        return self.expected - float(self.pnl[_tail(self.pnl, self.confidence)].mean())
+
+    def percentiles(self, q=(1, 5, 25, 50, 75, 95, 99)):
+        """Return ``{q: P&L}`` at the given percentiles of the distribution."""
+        return dict(zip(q, np.percentile(self.pnl, q).tolist()))
+
+    def rows(self):
+        """Yield one dict per traded route, largest CVaR contribution first."""
+        for i in np.argsort(-self.contribution, kind="stable"):
+            p, L, S, m, n = self.econ.route_key(self.routes[i])
+            yield {"product": p, "buy_location": L, "sell_option": S, "buy_month": m, "sell_month": n,
+                   "mean": float(self.route_mean[i]), "std": float(self.route_std[i]),
+                   "cvar_contribution": float(self.contribution[i])}
+
+
+def _tail(pnl, confidence):
+    # The worst (1 - confidence) share of paths, at least one.
+    k = max(1, int(np.ceil((1.0 - confidence) * len(pnl))))
+    return np.argpartition(pnl, k - 1)[:k]
+
+
+def route_pnl_sensitivity(months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                          pipeline_fixed, storage_cost):
+    """Return the route economics and their exact change per $1 move of each factor month.
+
+    Route profits are affine in the curves, so one unit bump per factor and
+    month gives the derivatives ``d_long``/``d_short`` as
+    [factor * month, route] arrays, ordered as ``RISK_FACTORS``.
+    """
+    curves = {"midland_price": dict(midland_price), "houston_price": dict(houston_price),
+              "Delta_M": dict(Delta_M), "Delta_H": dict(Delta_H)}
+
+    def economics(c):
+        return route_economics(months, c["midland_price"], c["houston_price"], c["Delta_M"], c["Delta_H"],
+                               forecast_adjustment, pipeline_fixed, storage_cost)
+
+    econ = economics(curves)
+    base_long, base_short = econ.route_long(), econ.route_short()
+    d_long = np.empty((len(RISK_FACTORS) * len(months), econ.n_routes))
+    d_short = np.empty_like(d_long)
+    for f, field in enumerate(RISK_FACTORS):
+        for t, month in enumerate(months):
+            bumped = dict(curves, **{field: dict(curves[field], **{month: curves[field][month] + 1.0})})
+            bumped_econ = economics(bumped)
+            d_long[f * len(months) + t] = bumped_econ.route_long() - base_long
+            d_short[f * len(months) + t] = bumped_econ.route_short() - base_short
+    return econ, d_long, d_short
+
+
+def _factor_shocks(rng, n_paths, n_months, chol, vol):
+    # Correlated monthly increments, accumulated so month t is t + 1 months out: [path, factor * month].
+    steps = rng.standard_normal((n_paths, n_months, len(vol))) @ chol.T * vol
+    return np.cumsum(steps, axis=1).transpose(0, 2, 1).reshape(n_paths, -1)
+
+
+def simulate_pnl(long, short, months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                 pipeline_fixed, storage_cost, n_paths=100_000, vol=FACTOR_VOL,
+                 correlation=FACTOR_CORRELATION, confidence=0.95, seed=None, threshold=1e-3,
+                 chunk_bytes=CHUNK_BYTES):
+    """Simulate the realized P&L of the book ``long``/``short`` (route volume arrays).
+
+    Midland, Houston and the two sour differentials follow correlated
+    arithmetic random walks with monthly volatility ``vol``; each month's
+    price is the current curve plus the walk to that month. Every traded
+    route is repriced on every path as one matrix product per chunk of
+    paths, with P&L measured as in the objective (``route_long`` per long
+    barrel less ``route_short`` per short barrel). Chunks are sized to
+    ``chunk_bytes`` and regenerated from their own seeds, so memory stays
+    bounded at any path count; a second pass over the tail paths gives
+    each route's CVaR contribution. A given ``seed`` and ``chunk_bytes``
+    reproduce the same paths.
+    """
+    start = time.perf_counter()
+    econ, d_long, d_short = route_pnl_sensitivity(months, midland_price, houston_price, Delta_M, Delta_H,
+                                                  forecast_adjustment, pipeline_fixed, storage_cost)
+    routes = np.nonzero((long > threshold) | (short > threshold))[0]
+    base = long[routes] * econ.route_long()[routes] - short[routes] * econ.route_short()[routes]
+    weights = d_long[:, routes] * long[routes] - d_short[:, routes] * short[routes]   # [factor*month, route]
+
+    vol = np.asarray(vol, dtype=float)
+    chol = np.linalg.cholesky(np.asarray(correlation, dtype=float))
+    T = len(months)
+    chunk = max(1, min(n_paths, chunk_bytes // (8 * (len(routes) + 2 * weights.shape[0] + 1))))
+    bounds = list(range(0, n_paths, chunk)) + [n_paths]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds) - 1)
+
+    def chunks():
+        for lo, hi, s in zip(bounds[:-1], bounds[1:], seeds):
+            yield lo, hi, _factor_shocks(np.random.default_rng(s), hi - lo, T, chol, vol)
+
+    pnl = np.empty(n_paths)
+    total = np.zeros(len(routes))
+    total_sq = np.zeros(len(routes))
+    for lo, hi, shocks in chunks():
+        route_pnl = base + shocks @ weights
+        pnl[lo:hi] = route_pnl.sum(axis=1)
+        total += route_pnl.sum(axis=0)
+        total_sq += np.einsum("ij,ij->j", route_pnl, route_pnl)
+    route_mean = total / n_paths
+    route_std = np.sqrt(np.maximum(total_sq / n_paths - route_mean ** 2, 0.0))
+
+    in_tail = np.zeros(n_paths, dtype=bool)
+    in_tail[_tail(pnl, confidence)] = True
+    tail_total = np.zeros(len(routes))
+    for lo, hi, shocks in chunks():
+        tail_total += (base + shocks[in_tail[lo:hi]] @ weights).sum(axis=0)
+    contribution = route_mean - tail_total / in_tail.sum()
+    return RiskReport(econ, confidence, pnl, routes, route_mean, route_std, contribution,
+                      time.perf_counter() - start)
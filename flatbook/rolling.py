@@ -0,0 +1,116 @@
+import time
+
+import numpy as np
+
+from flatbook.definition import ModelDefinition, generate_routes
+from flatbook.economics import SparseRouteEconomics
+from flatbook.network import inventory_load
+from flatbook.sparse import SparseSolution, build_sparse_lp, solve_sparse_lp
+
+
+class RollingSolution(SparseSolution):
+    """Committed trades of a rolling-horizon solve.
+
+    ``econ`` lists only the committed routes, labelled with the full
+    horizon's months, so ``trades()`` and ``position_ledger`` work on it as
+    on any other solution. ``windows`` has one record per solved window.
+    """
+
+    def __init__(self, econ, status, message, objective, long, short, windows):
+        super().__init__(econ, status, message, objective, long, short, iterations=len(windows))
+        self.windows = windows
+
+
+def window_definition(definition, start, stop):
+    """Return ``definition`` restricted to months ``start <= t < stop``."""
+    d = definition
+    return ModelDefinition(d.products, d.buy_locations, d.sell_options, d.months[start:stop],
+                           d.buy_price[:, :, start:stop], d.sale_price[:, :, start:stop],
+                           d.link_product, d.link_location, d.link_option, d.link_max_hold, d.link_piped,
+                           d.daily_capacity, d.trading_days[start:stop], d.inventory_cap, d.storage_cost,
+                           d.pipeline_fixed, d.pipeline_rate, d.carry_credit)
+
+
+def solve_rolling(definition, window, overlap=0, threshold=0.0):
+    """Solve ``definition`` over a receding horizon of ``window`` months.
+
+    Each window is solved as the sparse LP, then the trades bought in its
+    first ``window - overlap`` months are committed and the next window
+    starts after them; the last window commits everything. Committed
+    trades still open at the next window's start carry forward: their sell
+    month capacity, their stored volume in ``InvCap`` and any long/short
+    imbalance (the next ``FlatBook`` rows offset it), so the committed book
+    is flat over the whole horizon. Routes that would start in a committed
+    month and end beyond the window are not considered. Each window builds
+    O(window^2) routes, so time and memory grow linearly with the horizon.
+    """
+    if not 0 <= overlap < window:
+        raise ValueError(f"overlap must be in [0, window); got overlap={overlap}, window={window}")
+    d = definition
+    P, L, T = len(d.products), len(d.buy_locations), len(d.months)
+    step = window - overlap
+    buy_used = np.zeros((P, T))
+    sell_used = np.zeros((P, T))
+    inv_used = np.zeros((L, T))
+    imbalance = np.zeros(P)
+    committed = []
+    windows = []
+    objective = 0.0
+    status, message = "Optimal", None
+
+    start = 0
+    while start < T:
+        clock = time.perf_counter()
+        stop = min(start + window, T)
+        commit_end = T if stop == T else start + step
+        wd = window_definition(d, start, stop)
+        econ = generate_routes(wd)
+        lp = build_sparse_lp(econ, wd.capacity, wd.inventory_cap)
+
+        # Capacity and storage already taken by earlier commitments; FlatBook offsets their imbalance.
+        PW = P * (stop - start)
+        lp.b_ub[:PW] = np.maximum(wd.capacity - buy_used[:, start:stop], 0.0).ravel()
+        lp.b_ub[PW:2 * PW] = np.maximum(wd.capacity - sell_used[:, start:stop], 0.0).ravel()
+        lp.b_ub[2 * PW:] = np.maximum(wd.inventory_cap[:, None] - inv_used[:, start:stop], 0.0).ravel()
+        lp.b_eq = -imbalance
+
+        solution = solve_sparse_lp(lp)
+        label = f"{d.months[start]}-{d.months[stop - 1]}"
+        record = {"window": label, "routes": econ.n_routes, "status": solution.status}
+        if solution.status != "Optimal":
+            status, message = solution.status, f"rolling: window {label}: {solution.message}"
+            record["seconds"] = time.perf_counter() - clock
+            windows.append(record)
+            break
+
+        p, l, s, m, n = econ.route_index()
+        keep = (m < commit_end - start) & ((solution.long > threshold) | (solution.short > threshold))
+        long = np.where(keep, solution.long, 0.0)
+        short = np.where(keep, solution.short, 0.0)
+        volume = long + short
+        np.add.at(buy_used, (p, m + start), volume)
+        np.add.at(sell_used, (p, n + start), volume)
+        inv_used[:, start:stop] += inventory_load(econ, long)
+        imbalance += np.bincount(p, weights=long - short, minlength=P)
+        objective += float(long @ econ.route_long() - short @ econ.route_short())
+        committed.append((p[keep], l[keep], s[keep], m[keep] + start, n[keep] + start,
+                          econ.route_long()[keep], econ.route_short()[keep], long[keep], short[keep]))
+
+        record["committed"] = int(keep.sum())
+        record["seconds"] = time.perf_counter() - clock
+        windows.append(record)
+        start = commit_end
+
+    if committed:
+        p, l, s, m, n, route_long, route_short, long, short = (np.concatenate(a) for a in zip(*committed))
+    else:
+        p = l = s = m = n = np.zeros(0, dtype=np.intp)
+        route_long = route_short = long = short = np.zeros(0)
+    order = np.lexsort((n, m, s, l, p))
+    econ = SparseRouteEconomics(d.products, d.buy_locations, d.sell_options, d.months,
+                                (p[order], l[order], s[order], m[order], n[order]),
+                                route_long[order], route_short[order])
+    if message is None:
+        message = f"rolling: {len(windows)} windows of {window} months, overlap {overlap}"
+    return RollingSolution(econ, status, message, objective if status == "Optimal" else None,
+                           long[order], short[order], windows)
@@ -0,0 +1,145 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from flatbook.economics import apply_price_changes, route_economics
+from flatbook.model import INVENTORY_CAP
+from flatbook.sparse import LINPROG_STATUS, build_sparse_lp
+
+# Per-process state set by _init_worker: the base inputs and the shared constraint rows.
+_BASE = None
+
+
+class ScenarioResults:
+    """Compact per-scenario table from ``run_scenarios``.
+
+    ``objective`` and ``nonzero_routes`` have one entry per scenario;
+    ``total_long``/``total_short`` are [scenario, product]. ``status`` holds
+    the solver status strings.
+    """
+
+    def __init__(self, products, status, objective, total_long, total_short, nonzero_routes,
+                 elapsed, workers):
+        self.products = tuple(products)
+        self.status = status
+        self.objective = objective
+        self.total_long = total_long
+        self.total_short = total_short
+        self.nonzero_routes = nonzero_routes
+        self.elapsed = elapsed
+        self.workers = workers
+
+    def __len__(self):
+        return len(self.objective)
+
+    @property
+    def scenarios_per_second(self):
+        return len(self) / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def scenarios_per_second_per_core(self):
+        return self.scenarios_per_second / self.workers
+
+    def rows(self):
+        """Yield one dict per scenario, suitable for printing or a DataFrame."""
+        for i in range(len(self)):
+            row = {"scenario": i, "status": self.status[i], "objective": float(self.objective[i]),
+                   "nonzero_routes": int(self.nonzero_routes[i])}
+            for j, p in enumerate(self.products):
+                row[f"long_{p}"] = float(self.total_long[i, j])
+                row[f"short_{p}"] = float(self.total_short[i, j])
+            yield row
+
+
+def _init_worker(base):
+    global _BASE
+    _BASE = base
+
+
+def _solve_chunk(chunk):
+    from scipy.optimize import linprog
+
+    base = _BASE
+    lp = base["lp"]
+    route_p = base["route_index"][0]
+    P = len(base["products"])
+    out = []
+    for index, changes in chunk:
+        curves = {field: dict(values) for field, values in base["curves"].items()}
+        costs = dict(base["costs"])
+        apply_price_changes(curves, costs, changes)
+        econ = route_economics(base["months"], curves["midland_price"], curves["houston_price"],
+                               curves["Delta_M"], curves["Delta_H"], curves["forecast_adjustment"],
+                               costs["pipeline_fixed"], costs["storage_cost"])
+        c = np.concatenate([-econ.route_long(), econ.route_short()])
+        res = linprog(c, A_ub=lp["A_ub"], b_ub=lp["b_ub"], A_eq=lp["A_eq"], b_eq=lp["b_eq"],
+                      bounds=(0, None), method="highs")
+        status = LINPROG_STATUS.get(res.status, "Undefined")
+        if res.x is None:
+            out.append((index, status, np.nan, np.zeros(P), np.zeros(P), 0))
+            continue
+        R = len(route_p)
+        long, short = res.x[:R], res.x[R:]
+        nonzero = int(np.count_nonzero((long > base["threshold"]) | (short > base["threshold"])))
+        out.append((index, status, -res.fun, np.bincount(route_p, weights=long, minlength=P),
+                    np.bincount(route_p, weights=short, minlength=P), nonzero))
+    return out
+
+
+def run_scenarios(scenarios, months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                  pipeline_fixed, storage_cost, cap, inventory_cap=INVENTORY_CAP, workers=None,
+                  chunksize=None, threshold=1e-3):
+    """Solve the flat-book LP for every scenario in ``scenarios`` across a process pool.
+
+    Each scenario is a dict of price changes in the form accepted by
+    ``apply_price_changes``: partial ``{month: value}`` curves and/or scalar
+    ``storage_cost``/``pipeline_fixed`` overrides applied to the base inputs.
+    The constraint rows are built once and shipped to each worker at start
+    up; only the objective vector is rebuilt per scenario. ``workers``
+    defaults to the machine's core count; ``workers=1`` solves in-process.
+    """
+    start = time.perf_counter()
+    curves = {"midland_price": dict(midland_price), "houston_price": dict(houston_price),
+              "Delta_M": dict(Delta_M), "Delta_H": dict(Delta_H),
+              "forecast_adjustment": dict(forecast_adjustment)}
+    costs = {"pipeline_fixed": pipeline_fixed, "storage_cost": storage_cost}
+    econ = route_economics(months, midland_price, houston_price, Delta_M, Delta_H, forecast_adjustment,
+                           pipeline_fixed, storage_cost)
+    lp = build_sparse_lp(econ, cap, inventory_cap)
+    base = {
+        "months": list(months), "products": econ.products, "curves": curves, "costs": costs,
+        "route_index": econ.route_index(), "threshold": threshold,
+        "lp": {"A_ub": lp.A_ub, "b_ub": lp.b_ub, "A_eq": lp.A_eq, "b_eq": lp.b_eq},
+    }
+
+    jobs = list(enumerate(scenarios))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+
+    if workers == 1:
+        _init_worker(base)
+        results = [_solve_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(base,)) as pool:
+            results = list(pool.map(_solve_chunk, chunks))
+
+    N = len(jobs)
+    P = len(econ.products)
+    status = [None] * N
+    objective = np.full(N, np.nan)
+    total_long = np.zeros((N, P))
+    total_short = np.zeros((N, P))
+    nonzero_routes = np.zeros(N, dtype=int)
+    for chunk in results:
+        for index, st, obj, lg, sh, nz in chunk:
+            status[index] = st
+            objective[index] = obj
+            total_long[index] = lg
+            total_short[index] = sh
+            nonzero_routes[index] = nz
+    return ScenarioResults(econ.products, status, objective, total_long, total_short, nonzero_routes,
+                           time.perf_counter() - start, workers)
@@ -0,0 +1,98 @@
+import numpy as np
+
+from flatbook.model import stored_routes
+
+
+class RouteScreen:
+    """Which long and short route directions survive screening, as masks over route ids.
+
+    ``dominated_long``/``dominated_short`` and ``unprofitable_long``/
+    ``unprofitable_short`` count the directions each rule removed.
+    """
+
+    def __init__(self, keep_long, keep_short, dominated_long, dominated_short, unprofitable_long,
+                 unprofitable_short):
+        self.keep_long = keep_long
+        self.keep_short = keep_short
+        self.dominated_long = dominated_long
+        self.dominated_short = dominated_short
+        self.unprofitable_long = unprofitable_long
+        self.unprofitable_short = unprofitable_short
+
+    @property
+    def n_variables(self):
+        return 2 * len(self.keep_long)
+
+    @property
+    def removed(self):
+        return self.n_variables - int(self.keep_long.sum()) - int(self.keep_short.sum())
+
+    def summary(self):
+        return {"variables": self.n_variables, "removed": self.removed,
+                "dominated_long": self.dominated_long, "dominated_short": self.dominated_short,
+                "unprofitable_long": self.unprofitable_long, "unprofitable_short": self.unprofitable_short}
+
+
+def _best_in_group(group, value, eligible):
+    # Per route, the best ``value`` among eligible routes of its group, and the first route attaining it.
+    best = np.full(group.max(initial=-1) + 1, -np.inf)
+    np.maximum.at(best, group[eligible], value[eligible])
+    first = np.full(len(best), len(group))
+    hits = np.nonzero(eligible & (value == best[group]))[0]
+    np.minimum.at(first, group[hits], hits)
+    return best[group], first[group]
+
+
+def screen_routes(econ):
+    """Drop route directions that cannot be needed for an optimal solution.
+
+    Directions are compared by their objective coefficient: ``route_long``
+    for ``xplus`` and ``-route_short`` for ``xminus``. Two rules apply, and
+    each keeps at least one optimal solution:
+
+    * Dominance. Routes of one product with the same buy and sell month sit
+      in the same ``BuyCap``, ``SellCap`` and ``FlatBook`` rows, so all short
+      directions but the best are redundant, and a long direction is
+      redundant when a route that uses no ``InvCap`` row pays at least as
+      much (ties keep the lowest route id).
+    * Profitability. A long barrel is only worth trading against a short
+      barrel of the same product, so a long direction whose coefficient
+      plus the product's best short coefficient is not positive can be
+      traded down in pairs without losing profit; likewise for shorts.
+
+    A product left with no direction keeps its best long one, so every
+    engine still sees a non-empty model with the zero book as its optimum.
+    """
+    route_p, _, _, route_m, route_n = econ.route_index()
+    R, T = econ.n_routes, len(econ.months)
+    a = econ.route_long()
+    b = -econ.route_short()
+    group = (route_p.astype(np.int64) * T + route_m) * T + route_n
+    in_storage = np.zeros(R, dtype=bool)
+    in_storage[stored_routes(econ)] = True
+    ids = np.arange(R)
+
+    best_free, first_free = _best_in_group(group, a, ~in_storage)
+    keep_long = (a > best_free) | (~in_storage & (ids == first_free))
+    best_short, first_short = _best_in_group(group, b, np.ones(R, dtype=bool))
+    keep_short = ids == first_short
+    dominated_long = R - int(keep_long.sum())
+    dominated_short = R - int(keep_short.sum())
+
+    P = len(econ.products)
+    top_long = np.full(P, -np.inf)
+    top_short = np.full(P, -np.inf)
+    np.maximum.at(top_long, route_p, a)
+    np.maximum.at(top_short, route_p, b)
+    profitable_long = a + top_short[route_p] > 0
+    profitable_short = b + top_long[route_p] > 0
+    kept_long = keep_long & profitable_long
+    kept_short = keep_short & profitable_short
+    # An extra column cannot change the optimum; an empty model would break the solvers.
+    bare = np.bincount(route_p[kept_long | kept_short], minlength=P) == 0
+    _, first_top = _best_in_group(route_p.astype(np.int64), a, keep_long)
+    kept_long |= bare[route_p] & (ids == first_top)
+    unprofitable_long = int((keep_long & ~kept_long).sum())
+    unprofitable_short = int((keep_short & ~kept_short).sum())
+    return RouteScreen(kept_long, kept_short, dominated_long, dominated_short, unprofitable_long,
+                       unprofitable_short)
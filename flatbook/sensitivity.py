@@ -0,0 +1,136 @@
+import numpy as np
+
+from flatbook.model import INVENTORY_CAP
+from flatbook.sparse import build_sparse_lp, highs_solver
+
+
+def _values(ranging_record):
+    return np.array(ranging_record.value_, dtype=float)
+
+
+class SensitivityReport:
+    """Shadow prices, reduced costs and ranging of one LP solve, in profit terms.
+
+    Rows follow ``SparseLP``: the ``A_ub`` rows (``BuyCap``, ``SellCap``,
+    ``InvCap``) then the ``FlatBook`` rows. ``shadow_prices[i]`` is the
+    profit gained per barrel added to row ``i``'s right-hand side, valid
+    while that right-hand side stays within ``[rhs_lower[i], rhs_upper[i]]``.
+
+    Columns are the ``xplus`` then ``xminus`` volumes. ``reduced_costs[j]``
+    is the profit a column earns at the current shadow prices (zero or
+    negative at the optimum), and the basis stays optimal while the
+    column's per-barrel profit stays within ``[profit_lower[j], profit_upper[j]]``.
+    """
+
+    def __init__(self, lp, objective, activity, rhs, shadow_prices, rhs_lower, rhs_upper,
+                 values, reduced_costs, profit_lower, profit_upper):
+        self.lp = lp
+        self.objective = objective
+        self.activity = activity
+        self.rhs = rhs
+        self.shadow_prices = shadow_prices
+        self.rhs_lower = rhs_lower
+        self.rhs_upper = rhs_upper
+        self.values = values
+        self.reduced_costs = reduced_costs
+        self.profit = -lp.c
+        self.profit_lower = profit_lower
+        self.profit_upper = profit_upper
+        self._row_ids = None
+
+    @property
+    def n_rows(self):
+        return len(self.rhs)
+
+    def row_name(self, i):
+        n_ub = len(self.lp.b_ub)
+        return self.lp.row_name(i) if i < n_ub else self.lp.row_name(i - n_ub, equality=True)
+
+    def row_id(self, name):
+        """Return the row number for ``name`` (e.g. ``"BuyCap_WTI_May"``), or raise ``KeyError``."""
+        if self._row_ids is None:
+            self._row_ids = {self.row_name(i): i for i in range(self.n_rows)}
+        return self._row_ids[name]
+
+    def shadow_price(self, name):
+        return float(self.shadow_prices[self.row_id(name)])
+
+    def value_of_change(self, changes):
+        """Price a set of right-hand-side changes ``{row name: delta}`` from the duals.
+
+        Returns ``(value, within_range)``. ``within_range`` is False when any
+        single row leaves its ranging interval, in which case the value is
+        only a bound and the change needs a re-solve. Ranging is per row,
+        so large simultaneous changes can also cross a basis change.
+        """
+        value = 0.0
+        within_range = True
+        for name, delta in changes.items():
+            i = self.row_id(name)
+            value += self.shadow_prices[i] * delta
+            target = self.rhs[i] + delta
+            within_range &= bool(self.rhs_lower[i] - 1e-6 <= target <= self.rhs_upper[i] + 1e-6)
+        return float(value), within_range
+
+    def rows(self, binding_only=False, tol=1e-9):
+        """Yield one dict per constraint row, optionally only those with a nonzero shadow price."""
+        for i in range(self.n_rows):
+            if binding_only and abs(self.shadow_prices[i]) <= tol:
+                continue
+            name = self.row_name(i)
+            yield {"name": name, "family": name.split("_", 1)[0], "activity": float(self.activity[i]),
+                   "rhs": float(self.rhs[i]), "shadow_price": float(self.shadow_prices[i]),
+                   "rhs_lower": float(self.rhs_lower[i]), "rhs_upper": float(self.rhs_upper[i])}
+
+    def columns(self, threshold=None):
+        """Yield one dict per column, optionally only those with volume above ``threshold``."""
+        R = self.lp.n_routes
+        econ = self.lp.econ
+        for j in range(self.lp.n_variables):
+            if threshold is not None and self.values[j] <= threshold:
+                continue
+            yield {"name": self.lp.variable_name(j), "route": econ.route_key(j % R),
+                   "direction": "long" if j < R else "short", "value": float(self.values[j]),
+                   "reduced_cost": float(self.reduced_costs[j]), "profit": float(self.profit[j]),
+                   "profit_lower": float(self.profit_lower[j]), "profit_upper": float(self.profit_upper[j])}
+
+
+def sensitivity_report(econ, cap, inventory_cap=INVENTORY_CAP):
+    """Solve the continuous flat-book LP once with HiGHS and report its duals and ranging.
+
+    Only the LP has meaningful duals; the MIP's ``yplus``/``yminus``
+    binaries are not modelled here. HiGHS minimizes the negated profit, so
+    every dual and cost range is flipped back to the maximize sense.
+    """
+    lp = build_sparse_lp(econ, cap, inventory_cap)
+    highs = highs_solver(lp)
+    highs.run()
+    status = highs.modelStatusToString(highs.getModelStatus())
+    if status != "Optimal":
+        raise RuntimeError(f"Sensitivity needs an optimal LP; solve ended with status {status}")
+
+    solution = highs.getSolution()
+    _, ranging = highs.getRanging()
+    rhs = np.concatenate([lp.b_ub, lp.b_eq])
+    activity = np.array(solution.row_value)
+    rhs_lower = _values(ranging.row_bound_dn)
+    rhs_upper = _values(ranging.row_bound_up)
+    # HiGHS leaves bound ranging undefined on rows with slack: such a cap can
+    # fall to the row's activity or rise without limit before the basis changes.
+    slack = np.zeros(len(rhs), dtype=bool)
+    slack[:len(lp.b_ub)] = activity[:len(lp.b_ub)] < lp.b_ub - 1e-6
+    rhs_lower[slack] = activity[slack]
+    rhs_upper[slack] = np.inf
+    # Cost ranging bounds the minimized cost -profit, so the profit interval is [-up, -down].
+    return SensitivityReport(
+        lp, -highs.getInfo().objective_function_value,
+        activity=activity,
+        rhs=rhs,
+        shadow_prices=-np.array(solution.row_dual),
+        rhs_lower=rhs_lower,
+        rhs_upper=rhs_upper,
+        values=np.array(solution.col_value),
+        reduced_costs=-np.array(solution.col_dual),
+        profit_lower=-_values(ranging.col_cost_up),
+        profit_upper=-_values(ranging.col_cost_dn),
+    )
@@ -0,0 +1,316 @@
+"""Long-lived optimization service holding a hot flat-book model.
+
+The service keeps an ``IncrementalModel`` built once and answers JSON
+requests over minimal HTTP/1.1, on TCP (``HOST:PORT``) or a Unix socket
+(``unix:PATH``)::
+
+    GET  /state     status, objective and trades of the committed model
+    POST /update    {"changes": {...}}             commit a price tick, re-solve warm
+    POST /capacity  {"cap": {...}, "inventory_cap": ...}   commit new limits
+    POST /whatif    {"changes": {...}}             solve on the worker pool, commit nothing
+
+``changes`` takes the ``apply_price_changes`` form: partial ``{month: value}``
+curves and scalar ``pipeline_fixed``/``storage_cost``. Identical requests
+that arrive while one is being solved share its answer. Start it from a
+script with ``python algo.py --serve 127.0.0.1:8765``.
+"""
+import asyncio
+import http.client
+import json
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from flatbook.cache import input_key
+from flatbook.incremental import IncrementalModel
+
+# Per-process state set by _init_worker: a what-if replica of the hot model.
+_REPLICA = None
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _trades(econ, long, short, threshold):
+    active = (long > threshold) | (short > threshold)
+    return [{"route": list(econ.route_key(r)), "long": float(long[r]), "short": float(short[r])}
+            for r in active.nonzero()[0]]
+
+
+def _model_inputs(model):
+    return {"months": model.months, **model.curves, **model.costs, "cap": model.cap,
+            "inventory_cap": model.inventory_cap, "threshold": model.threshold}
+
+
+def _init_worker(inputs):
+    global _REPLICA
+    _REPLICA = IncrementalModel(**inputs)
+
+
+def _sync(model, inputs):
+    # Bring a replica to the committed prices and limits; each step re-solves only if something moved.
+    curves = {field: inputs[field] for field in model.curves}
+    costs = {field: inputs[field] for field in model.costs}
+    if curves != model.curves or costs != model.costs:
+        model.update(**curves, **costs)
+    if inputs["cap"] != model.cap or inputs["inventory_cap"] != model.inventory_cap:
+        model.update_capacity(inputs["cap"], inputs["inventory_cap"])
+
+
+def _evaluate(model, changes):
+    start = time.perf_counter()
+    status, objective, long, short = model.evaluate(**changes)
+    result = {"status": status, "objective": objective, "solve_ms": 1000 * (time.perf_counter() - start)}
+    if long is not None:
+        econ = model._economics()
+        result["trades"] = _trades(econ, long, short, model.threshold)
+    return result
+
+
+def _worker_whatif(inputs, changes):
+    _sync(_REPLICA, inputs)
+    return _evaluate(_REPLICA, changes)
+
+
+def _object(body, field, default):
+    # ``body[field]``, which must be a JSON object when present.
+    value = body.get(field, default)
+    if value is not default and not isinstance(value, dict):
+        raise TypeError(f"{field!r} must be a JSON object, not {type(value).__name__}")
+    return value
+
+
+class OptimizationService:
+    """Request handling around one hot ``IncrementalModel``.
+
+    Commits (``/update``, ``/capacity``) run one at a time on a dedicated
+    thread so the event loop stays free. What-ifs run on a process pool
+    whose workers each hold a replica synced to the committed inputs;
+    ``workers=0`` evaluates them on the model thread instead. Requests with
+    the same path and body against the same model version are coalesced.
+    """
+
+    def __init__(self, model, workers=None):
+        self.model = model
+        self.version = 0
+        self._inflight = {}
+        self._model_thread = ThreadPoolExecutor(max_workers=1)
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(_model_inputs(model),)) if workers > 0 else None
+
+    def close(self):
+        self._model_thread.shutdown()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    async def handle(self, method, path, body=None):
+        """Answer one request and return ``(http_status, payload)``."""
+        route = {("GET", "/state"): self._state, ("POST", "/update"): self._update,
+                 ("POST", "/capacity"): self._capacity, ("POST", "/whatif"): self._whatif}
+        if (method, path) not in route:
+            known = any(path == p for _, p in route)
+            return (405 if known else 404), {"error": f"{method} {path} is not served"}
+        if body is not None and not isinstance(body, dict):
+            return 400, {"error": f"the request body must be a JSON object, not {type(body).__name__}"}
+        key = input_key(method=method, path=path, body=body, version=self.version)
+        if key not in self._inflight:
+            self._inflight[key] = asyncio.ensure_future(self._answer(route[method, path], body or {}))
+            self._inflight[key].add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(self._inflight[key])
+
+    async def _answer(self, handler, body):
+        try:
+            return 200, await handler(body)
+        except (TypeError, ValueError, KeyError) as exc:
+            return 400, {"error": f"{type(exc).__name__}: {exc}"}
+
+    def _on_model_thread(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self._model_thread, fn, *args)
+
+    def _summary(self):
+        # Model thread only: a commit in flight there would otherwise be read half-applied.
+        model = self.model
+        return {"status": model.status, "objective": model.objective, "iterations": model.iterations,
+                "solve_ms": 1000 * model.solve_seconds}
+
+    def _snapshot(self):
+        model = self.model
+        return {**self._summary(), "trades": _trades(model.econ, model.long, model.short, model.threshold)}
+
+    async def _state(self, body):
+        snapshot = await self._on_model_thread(self._snapshot)
+        return {"version": self.version, **snapshot}
+
+    def _changed(self, moved):
+        return [{"route": list(key), "old_long": v[0], "old_short": v[1], "long": v[2], "short": v[3]}
+                for key, v in moved.items()]
+
+    async def _update(self, body):
+        changes = _object(body, "changes", {})
+        moved, summary = await self._on_model_thread(lambda: (self.model.update(**changes), self._summary()))
+        self.version += 1
+        return {"version": self.version, **summary, "changed": self._changed(moved)}
+
+    async def _capacity(self, body):
+        cap = _object(body, "cap", None)
+        moved, summary = await self._on_model_thread(
+            lambda: (self.model.update_capacity(cap, body.get("inventory_cap")), self._summary()))
+        self.version += 1
+        return {"version": self.version, **summary, "changed": self._changed(moved)}
+
+    async def _whatif(self, body):
+        changes = _object(body, "changes", {})
+        if self._pool is None:
+            result = await self._on_model_thread(_evaluate, self.model, changes)
+        else:
+            # Snapshot on the model thread so an update in flight cannot be read half-applied.
+            inputs = await self._on_model_thread(_model_inputs, self.model)
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, _worker_whatif, inputs, changes)
+        return {"version": self.version, **result}
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError(f"malformed request line {line[:80]!r}")
+    method, target, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], headers, body
+
+
+def _write_response(writer, status, payload):
+    data = json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+
+
+async def _serve_connection(service, reader, writer):
+    # HTTP/1.1 keep-alive: answer requests on this connection until the client closes it.
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except ValueError as exc:
+                # The stream cannot be resynchronized after a bad request head, so answer and close.
+                _write_response(writer, 400, {"error": str(exc)})
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, path, headers, raw = request
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError as exc:
+                status, payload = 400, {"error": f"invalid JSON: {exc}"}
+            else:
+                status, payload = await service.handle(method, path, body)
+            _write_response(writer, status, payload)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, address):
+    """Serve ``service`` on ``HOST:PORT`` or ``unix:PATH`` until cancelled."""
+    handler = lambda reader, writer: _serve_connection(service, reader, writer)  # noqa: E731
+    if address.startswith("unix:"):
+        server = await asyncio.start_unix_server(handler, path=address[len("unix:"):])
+    else:
+        host, _, port = address.rpartition(":")
+        server = await asyncio.start_server(handler, host or "127.0.0.1", int(port))
+    async with server:
+        await server.serve_forever()
+
+
+def run_service(model, address, workers=None):
+    """Block serving ``model`` at ``address`` until interrupted."""
+    service = OptimizationService(model, workers)
+    print(f"Serving the flat-book model on {address}", flush=True)
+    try:
+        asyncio.run(serve(service, address))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+class _Client:
+    # Request helpers shared by the network and in-process clients.
+
+    def state(self):
+        return self.request("GET", "/state")
+
+    def update(self, **changes):
+        return self.request("POST", "/update", {"changes": changes})
+
+    def capacity(self, cap=None, inventory_cap=None):
+        return self.request("POST", "/capacity", {"cap": cap, "inventory_cap": inventory_cap})
+
+    def whatif(self, **changes):
+        return self.request("POST", "/whatif", {"changes": changes})
+
+
+class ServiceClient(_Client):
+    """Blocking client for a running service, keeping one connection open."""
+
+    def __init__(self, address, timeout=30.0):
+        if address.startswith("unix:"):
+            self.connection = _UnixConnection(address[len("unix:"):])
+        else:
+            host, _, port = address.rpartition(":")
+            self.connection = http.client.HTTPConnection(host or "127.0.0.1", int(port), timeout=timeout)
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self.connection.request(method, path, body=data, headers=headers)
+        response = self.connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} failed with {response.status}: {payload.get('error')}")
+        return payload
+
+    def close(self):
+        self.connection.close()
+
+
+class LocalClient(_Client):
+    """In-process stub with the ``ServiceClient`` interface, for tests and notebooks.
+
+    Requests go straight to an ``OptimizationService`` without a socket.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def request(self, method, path, body=None):
+        status, payload = asyncio.run(self.service.handle(method, path, body))
+        if status != 200:
+            raise RuntimeError(f"{method} {path} failed with {status}: {payload.get('error')}")
+        return payload
@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import queue
+import signal
+import time
+
+# PuLP backends, in the order racing tries them.
+SOLVER_BACKENDS = ("cbc", "highs", "glpk")
+# Seconds between checks that racing backends are still alive.
+_POLL = 1.0
+
+
+def solver_command(backend, time_limit=None, mip_gap=None, threads=None, msg=0, log_path=None):
+    """Return the PuLP solver object for ``backend`` with the given limits.
+
+    ``time_limit`` is in seconds and ``mip_gap`` is relative. GLPK is
+    single-threaded, so ``threads`` is ignored there; ``log_path`` applies
+    to CBC only.
+    """
+    import pulp
+
+    if backend == "cbc":
+        return pulp.PULP_CBC_CMD(msg=msg, timeLimit=time_limit, gapRel=mip_gap, threads=threads,
+                                 logPath=log_path)
+    if backend == "highs":
+        return pulp.HiGHS(msg=bool(msg), timeLimit=time_limit, gapRel=mip_gap, threads=threads)
+    if backend == "glpk":
+        options = ["--mipgap", repr(mip_gap)] if mip_gap is not None else []
+        return pulp.GLPK_CMD(msg=msg, timeLimit=time_limit, options=options)
+    raise ValueError(f"Unknown solver backend {backend!r}; expected one of {SOLVER_BACKENDS}")
+
+
+def available_backends():
+    """Return the backends in ``SOLVER_BACKENDS`` whose solver is installed."""
+    return tuple(b for b in SOLVER_BACKENDS if solver_command(b).available())
+
+
+def solve_pulp(prob, backend="cbc", time_limit=None, mip_gap=None, threads=None, msg=0):
+    """Solve ``prob`` in place with one backend and return its run statistics."""
+    import pulp
+
+    start = time.perf_counter()
+    prob.solve(solver_command(backend, time_limit, mip_gap, threads, msg))
+    return {"solver": backend, "status": pulp.LpStatus[prob.status],
+            "solution_status": pulp.LpSolution[prob.sol_status], "solve_seconds": time.perf_counter() - start}
+
+
+def _race_entry(backend, problem, options, results):
+    # Lead a process group so cancelling also stops any solver binary this backend spawned.
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    import pulp
+
+    start = time.perf_counter()
+    try:
+        if isinstance(problem, dict):
+            _, problem = pulp.LpProblem.from_dict(problem)
+        # The backend's clock starts here; loading the problem does not count against its limit.
+        results.put((backend, "started", None))
+        start = time.perf_counter()
+        problem.solve(solver_command(backend, **options))
+        values = {v.name: v.varValue for v in problem.variables()}
+        results.put((backend, "done", (problem.status, problem.sol_status, pulp.value(problem.objective), values,
+                                       time.perf_counter() - start, None)))
+    except Exception as exc:  # reported to the parent; the race goes on without this backend
+        results.put((backend, "done", (None, None, None, None, time.perf_counter() - start,
+                                       f"{type(exc).__name__}: {exc}")))
+
+
+def _cancel(process):
+    if process.is_alive():
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            process.terminate()
+    process.join()
+
+
+def race_pulp(prob, backends=None, time_limit=None, mip_gap=None, threads=None, grace=5.0):
+    """Solve ``prob`` with several backends at once and keep the first proven optimum.
+
+    Each backend runs in its own process on a copy of ``prob`` with
+    ``time_limit`` as its own limit. Forked processes inherit ``prob``;
+    otherwise it is serialized once for all of them. The first backend to
+    prove optimality wins and the others are killed at once. A backend
+    still running ``time_limit + grace`` seconds after its solve started
+    is cancelled; one still loading the problem is not. If none proves
+    optimality, the best incumbent reported wins (by objective, in
+    ``prob``'s sense). The winner's values are loaded into ``prob`` as
+    ``prob.solve`` would; the returned statistics name the winner and how
+    every backend ended. ``backends`` defaults to every installed one.
+    """
+    import pulp
+
+    backends = tuple(backends or available_backends())
+    if not backends:
+        raise RuntimeError("No PuLP solver backend is installed")
+    options = {"time_limit": time_limit, "mip_gap": mip_gap, "threads": threads}
+    problem = prob if multiprocessing.get_start_method() == "fork" else prob.to_dict()
+    results = multiprocessing.Queue()
+    start = time.perf_counter()
+    processes = {b: multiprocessing.Process(target=_race_entry, args=(b, problem, options, results), daemon=True)
+                 for b in backends}
+    for process in processes.values():
+        process.start()
+
+    started = {}
+    outcomes = {}
+    best = None
+    try:
+        while len(outcomes) < len(backends):
+            now = time.perf_counter()
+            if time_limit is not None:
+                for backend, since in started.items():
+                    if backend not in outcomes and now >= since + time_limit + grace:
+                        _cancel(processes[backend])
+                        outcomes[backend] = {"status": "Timed out", "seconds": now - since}
+            for backend, process in processes.items():
+                if backend not in outcomes and not process.is_alive() and results.empty():
+                    outcomes[backend] = {"status": f"Exited with code {process.exitcode}",
+                                         "seconds": now - started.get(backend, start)}
+            if len(outcomes) == len(backends):
+                break
+            deadlines = [since + time_limit + grace for b, since in started.items()
+                         if b not in outcomes and time_limit is not None]
+            wait = min(_POLL, max(0.0, min(deadlines) - now)) if deadlines else _POLL
+            try:
+                backend, event, outcome = results.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if backend in outcomes:
+                continue
+            if event == "started":
+                started[backend] = time.perf_counter()
+                continue
+            status, sol_status, objective, values, seconds, error = outcome
+            outcomes[backend] = {"status": error or pulp.LpStatus[status], "seconds": seconds}
+            if values is None or sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                continue
+            better = best is None or (objective - best[3]) * prob.sense < 0
+            if sol_status == pulp.LpSolutionOptimal or better:
+                best = (backend, status, sol_status, objective, values)
+            if sol_status == pulp.LpSolutionOptimal:
+                break
+    finally:
+        for backend, process in processes.items():
+            if process.is_alive():
+                outcomes.setdefault(backend, {"status": "Cancelled",
+                                              "seconds": time.perf_counter() - started.get(backend, start)})
+            _cancel(process)
+
+    stats = {"solver": best[0] if best else None, "race": outcomes, "solve_seconds": time.perf_counter() - start}
+    if best is None:
+        prob.assignStatus(pulp.LpStatusNotSolved, pulp.LpSolutionNoSolutionFound)
+    else:
+        backend, status, sol_status, _, values = best
+        for v in prob.variables():
+            v.varValue = values.get(v.name)
+        prob.assignStatus(status, sol_status)
+    stats["status"] = pulp.LpStatus[prob.status]
+    stats["solution_status"] = pulp.LpSolution[prob.sol_status]
+    return stats
@@ -0,0 +1,185 @@
+import numpy as np
+
+from flatbook.model import INVENTORY_CAP, capacity_array, inventory_cap_array, stored_routes
+
+# linprog status codes mapped onto the PuLP status strings the scripts print.
+LINPROG_STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Not Solved"}
+
+
+class SparseLP:
+    """The flat-book LP as arrays, in ``scipy.optimize.linprog`` form.
+
+    Columns ``0..R-1`` are the ``xplus`` long volumes and ``R..2R-1`` the
+    ``xminus`` short volumes, with routes ordered as ``econ.route_index()``.
+    ``A_ub`` stacks the ``BuyCap``, ``SellCap`` and ``InvCap`` rows and
+    ``A_eq`` holds one ``FlatBook`` row per product. ``c`` is the negated
+    profit because ``linprog`` minimizes. When built from a route screen,
+    ``columns`` maps each kept column to its place in that full layout.
+    """
+
+    def __init__(self, econ, c, A_ub, b_ub, A_eq, b_eq, n_routes, inventory_locations, columns=None):
+        self.econ = econ
+        self.c = c
+        self.A_ub = A_ub
+        self.b_ub = b_ub
+        self.A_eq = A_eq
+        self.b_eq = b_eq
+        self.bounds = (0, None)
+        self.n_routes = n_routes
+        self.inventory_locations = inventory_locations
+        self.columns = columns
+
+    @property
+    def n_variables(self):
+        return len(self.c)
+
+    def route_volumes(self, x):
+        """Split a solution vector into (long, short) volume arrays over every route."""
+        if self.columns is not None:
+            full = np.zeros(2 * self.n_routes)
+            full[self.columns] = x
+            x = full
+        return x[:self.n_routes], x[self.n_routes:]
+
+    # Names are only built on request, for debugging and LP-file style output.
+    def variable_name(self, j):
+        if self.columns is not None:
+            j = int(self.columns[j])
+        prefix = "xplus" if j < self.n_routes else "xminus"
+        p, L, S, m, n = self.econ.route_key(j % self.n_routes)
+        return f"{prefix}_{p}_{L}_{S}_{m}_{n}"
+
+    def row_name(self, i, equality=False):
+        econ = self.econ
+        if equality:
+            return f"FlatBook_{econ.products[i]}"
+        T = len(econ.months)
+        block, offset = divmod(i, len(econ.products) * T)
+        if block == 0:
+            p, t = divmod(offset, T)
+            return f"BuyCap_{econ.products[p]}_{econ.months[t]}"
+        if block == 1:
+            p, t = divmod(offset, T)
+            return f"SellCap_{econ.products[p]}_{econ.months[t]}"
+        L, t = divmod(i - 2 * len(econ.products) * T, T)
+        return f"InvCap_{self.inventory_locations[L]}_{econ.months[t]}"
+
+
+def build_sparse_lp(econ, cap, inventory_cap=INVENTORY_CAP, screen=None):
+    """Emit the objective, constraint rows and bounds of the LP model as CSR matrices.
+
+    With a ``RouteScreen`` only the directions it keeps become columns.
+    """
+    from scipy import sparse
+
+    p, l, s, m, n = econ.route_index()
+    R = len(p)
+    P = len(econ.products)
+    T = len(econ.months)
+    routes = np.arange(R)
+    cap_arr = capacity_array(econ, cap)
+
+    c = np.concatenate([-econ.route_long(), econ.route_short()])
+
+    # BuyCap and SellCap: every long and short volume counts against its buy and sell month.
+    buy_rows = p * T + m
+    sell_rows = P * T + p * T + n
+
+    # InvCap: long volume stored at L (bought at L, sold via L) is open for months m <= t < n.
+    locations = econ.buy_locations
+    stored = stored_routes(econ)
+    held = n[stored] - m[stored]
+    inv_routes = np.repeat(stored, held)
+    starts = np.cumsum(held) - held
+    inv_months = np.repeat(m[stored], held) + (np.arange(held.sum()) - np.repeat(starts, held))
+    inv_rows = 2 * P * T + l[inv_routes] * T + inv_months
+
+    rows = np.concatenate([buy_rows, buy_rows, sell_rows, sell_rows, inv_rows])
+    cols = np.concatenate([routes, routes + R, routes, routes + R, inv_routes])
+    n_ub = 2 * P * T + len(locations) * T
+    A_ub = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_ub, 2 * R))
+    b_ub = np.concatenate([cap_arr.ravel(), cap_arr.ravel(), np.repeat(inventory_cap_array(econ, inventory_cap), T)])
+
+    # FlatBook: total long equals total short for each product.
+    eq_cols = np.concatenate([routes, routes + R])
+    eq_vals = np.concatenate([np.ones(R), -np.ones(R)])
+    A_eq = sparse.csr_matrix((eq_vals, (np.concatenate([p, p]), eq_cols)), shape=(P, 2 * R))
+    b_eq = np.zeros(P)
+
+    if screen is None:
+        return SparseLP(econ, c, A_ub, b_ub, A_eq, b_eq, R, locations)
+    columns = np.concatenate([np.nonzero(screen.keep_long)[0], R + np.nonzero(screen.keep_short)[0]])
+    return SparseLP(econ, c[columns], A_ub[:, columns], b_ub, A_eq[:, columns], b_eq, R, locations, columns)
+
+
+class SparseSolution:
+    """Route volumes and objective, aligned with ``econ.route_index()``."""
+
+    def __init__(self, econ, status, message, objective, long, short, lp=None, iterations=None):
+        self.econ = econ
+        self.lp = lp
+        self.status = status
+        self.message = message
+        self.objective = objective
+        self.long = long
+        self.short = short
+        self.iterations = iterations
+
+    def trades(self, threshold=1e-3):
+        """Map ``(p, L, S, m, n)`` route keys to ``(long, short)`` volumes for routes above ``threshold``."""
+        active = np.nonzero((self.long > threshold) | (self.short > threshold))[0]
+        econ = self.econ
+        return {econ.route_key(r): (float(self.long[r]), float(self.short[r])) for r in active}
+
+
+def solve_sparse_lp(lp, **options):
+    """Solve ``lp`` in-process with HiGHS through ``scipy.optimize.linprog``."""
+    from scipy.optimize import linprog
+
+    res = linprog(lp.c, A_ub=lp.A_ub, b_ub=lp.b_ub, A_eq=lp.A_eq, b_eq=lp.b_eq, bounds=lp.bounds,
+                  method="highs", options=options or None)
+    status = LINPROG_STATUS.get(res.status, "Undefined")
+    if res.x is None:
+        empty = np.zeros(lp.n_routes)
+        return SparseSolution(lp.econ, status, res.message, None, empty, empty.copy(), lp, res.nit)
+    long, short = lp.route_volumes(res.x)
+    return SparseSolution(lp.econ, status, res.message, -res.fun, long, short, lp, res.nit)
+
+
+def _highspy():
+    try:
+        import highspy
+    except ImportError as exc:
+        raise ImportError("This needs the HiGHS Python bindings: pip install highspy") from exc
+    return highspy
+
+
+def highs_solver(lp):
+    """Return a quiet ``highspy.Highs`` simplex instance loaded with ``lp``.
+
+    Rows are the ``A_ub`` rows followed by the ``A_eq`` rows, and columns
+    keep the ``SparseLP`` order, so HiGHS row and column indices match
+    ``row_name`` and ``variable_name``.
+    """
+    from scipy import sparse
+
+    highspy = _highspy()
+    A = sparse.vstack([lp.A_ub, lp.A_eq], format="csr")
+    model = highspy.HighsLp()
+    model.num_col_ = lp.n_variables
+    model.num_row_ = A.shape[0]
+    model.col_cost_ = lp.c
+    model.col_lower_ = np.zeros(lp.n_variables)
+    model.col_upper_ = np.full(lp.n_variables, highspy.kHighsInf)
+    model.row_lower_ = np.concatenate([np.full(len(lp.b_ub), -highspy.kHighsInf), lp.b_eq])
+    model.row_upper_ = np.concatenate([lp.b_ub, lp.b_eq])
+    model.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    model.a_matrix_.start_ = A.indptr
+    model.a_matrix_.index_ = A.indices
+    model.a_matrix_.value_ = A.data
+
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", False)
+    highs.setOptionValue("solver", "simplex")
+    highs.passModel(model)
+    return highs
@@ -0,0 +1,110 @@
+import cProfile
+import json
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Build phases wrapped by the optional cProfile/tracemalloc hooks.
+PROFILED_PHASES = ("build",)
+
+_CBC_PATTERNS = {
+    "iterations": (re.compile(r"Total iterations:\s+(\d+)"), int),
+    "nodes": (re.compile(r"Enumerated nodes:\s+(\d+)"), int),
+    "mip_gap": (re.compile(r"^Gap:\s+(\S+)", re.MULTILINE), float),
+}
+_CBC_LP_ITERATIONS = re.compile(r"Optimal objective \S+ - (\d+) iterations")
+
+
+def cbc_log_stats(text):
+    """Return iterations, nodes and MIP gap from a CBC log (None where CBC did not report one)."""
+    stats = {}
+    for field, (pattern, cast) in _CBC_PATTERNS.items():
+        match = pattern.search(text)
+        stats[field] = cast(match.group(1)) if match else None
+    if stats["iterations"] is None:
+        match = _CBC_LP_ITERATIONS.search(text)
+        stats["iterations"] = int(match.group(1)) if match else None
+    if stats["mip_gap"] is None and "Result - Optimal solution found" in text:
+        stats["mip_gap"] = 0.0
+    return stats
+
+
+def jsonl_sink(target):
+    """Return a sink that appends each run record as one JSON line to ``target`` ("-" for stderr)."""
+    def sink(record):
+        line = json.dumps(record, default=str)
+        if target == "-":
+            print(line, file=sys.stderr)
+        else:
+            with open(target, "a") as f:
+                f.write(line + "\n")
+    return sink
+
+
+def _top_functions(profiler, limit):
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [{"function": f"{path}:{line}({name})", "calls": calls, "total_seconds": tottime,
+             "cumulative_seconds": cumtime}
+            for (path, line, name), (_, calls, tottime, cumtime, _) in rows]
+
+
+class Telemetry:
+    """Collects one structured record per optimization run and hands it to every sink.
+
+    ``phase`` times a block into ``record["phases"]``; ``update`` adds
+    fields such as counts, status, iterations or objective; ``emit`` calls
+    each sink with the record. With ``profile`` or ``trace_memory`` set,
+    the phases in ``profile_phases`` also run under cProfile (top functions
+    by cumulative time) or tracemalloc (peak bytes); both slow the phase
+    they wrap.
+    """
+
+    def __init__(self, sinks=(), profile=False, trace_memory=False, profile_phases=PROFILED_PHASES,
+                 profile_limit=20):
+        self.sinks = list(sinks)
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_phases = tuple(profile_phases)
+        self.profile_limit = profile_limit
+        self.record = {"timestamp": datetime.now(timezone.utc).isoformat(), "phases": {}}
+
+    @property
+    def enabled(self):
+        return bool(self.sinks)
+
+    @contextmanager
+    def phase(self, name):
+        hooked = name in self.profile_phases
+        profiler = cProfile.Profile() if self.profile and hooked else None
+        tracing = self.trace_memory and hooked and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            phases = self.record["phases"]
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+            if profiler is not None:
+                self.record.setdefault("profile", {})[name] = _top_functions(profiler, self.profile_limit)
+            if tracing:
+                self.record.setdefault("peak_memory_bytes", {})[name] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+    def update(self, **fields):
+        self.record.update(fields)
+
+    def emit(self):
+        self.record["total_seconds"] = sum(self.record["phases"].values())
+        for sink in self.sinks:
+            sink(self.record)
+        return self.record
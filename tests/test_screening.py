@@ -0,0 +1,52 @@
+import pytest
+
+from flatbook.api import build_model, report, solve
+from flatbook.benchmark import synthetic_definition
+from flatbook.defaults import MONTHS
+from flatbook.definition import generate_routes
+from flatbook.screening import screen_routes
+from flatbook.sparse import build_sparse_lp, solve_sparse_lp
+
+FLAT = {m: 70.0 for m in MONTHS}
+ZERO = {m: 0.0 for m in MONTHS}
+RISING = {m: 70.0 + i for i, m in enumerate(MONTHS)}
+
+CASES = {
+    "shipped": {},
+    # A steep Midland contango fills the 100k barrel storage cap.
+    "binding_storage": {"midland_price": RISING, "storage_cost": 0.05, "inventory_cap": 100_000},
+    # Flat curves leave no profitable direction, so screening removes every route.
+    "all_unprofitable": {"midland_price": FLAT, "houston_price": FLAT, "Delta_M": ZERO, "Delta_H": ZERO},
+}
+
+
+@pytest.mark.parametrize("engine", ["sparse", "pulp"])
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_screened_objective_matches_unscreened(case, engine):
+    problem = build_model(**CASES[case])
+    full = solve(problem, engine)
+    screened = solve(problem, engine, screen=True)
+    assert screened.status == full.status == "Optimal"
+    assert screened.objective == pytest.approx(full.objective, rel=1e-9, abs=1e-6)
+    assert list(report(problem, screened).lines())
+
+
+def test_binding_storage_case_binds():
+    tight = solve(build_model(**CASES["binding_storage"]), "sparse")
+    loose = solve(build_model(**dict(CASES["binding_storage"], inventory_cap=10 ** 10)), "sparse")
+    assert tight.objective < loose.objective - 1.0
+
+
+def test_all_unprofitable_case_keeps_one_direction_per_product():
+    econ = build_model(**CASES["all_unprofitable"]).econ
+    screen = screen_routes(econ)
+    assert screen.removed == screen.n_variables - len(econ.products)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_screened_objective_matches_unscreened_on_synthetic_curves(seed):
+    d = synthetic_definition(12, 3, 2, max_hold=6, seed=seed)
+    econ = generate_routes(d)
+    full = solve_sparse_lp(build_sparse_lp(econ, d.capacity, d.inventory_cap))
+    screened = solve_sparse_lp(build_sparse_lp(econ, d.capacity, d.inventory_cap, screen=screen_routes(econ)))
+    assert screened.objective == pytest.approx(full.objective, rel=1e-9)